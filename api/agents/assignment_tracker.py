@@ -1,6 +1,8 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 import logging
-from datetime import datetime
+import re
+from collections import Counter
+from datetime import datetime, date
 
 from api.services.sheets_service import SheetsService
 from api.services.matching_service import MatchingService
@@ -10,6 +12,17 @@ from api.models.mission import Mission
 
 logger = logging.getLogger(__name__)
 
+# Missions, pilots and drones fetched together for a single query
+DataSnapshot = Tuple[List[Mission], List[Pilot], List[Drone]]
+
+# Query intents in priority order; lookaheads keep keyword order irrelevant
+_INTENT_PATTERN = re.compile(
+    r"(?:(?P<suggest>(?=.*assign)(?=.*mission))"
+    r"|(?P<current>(?=.*current)(?=.*assignment))"
+    r"|(?P<match>(?=.*match)))",
+    re.IGNORECASE | re.DOTALL
+)
+
 class AssignmentTracker:
     """Agent for tracking and managing assignments"""
     
@@ -19,20 +32,29 @@ class AssignmentTracker:
     
     def handle_query(self, query: str) -> str:
         """Handle assignment-related queries"""
-        if "assign" in query.lower() and "mission" in query.lower():
-            return self.suggest_assignments(query)
-        elif "current" in query.lower() and "assignment" in query.lower():
-            return self.get_current_assignments()
-        elif "match" in query.lower():
-            return self.find_matches_for_mission(query)
+        match = _INTENT_PATTERN.match(query)
+        intent = match.lastgroup if match else None
+        
+        if intent == "suggest":
+            return self.suggest_assignments(query, self._fetch_snapshot())
+        elif intent == "current":
+            return self.get_current_assignments(self._fetch_snapshot())
+        elif intent == "match":
+            return self.find_matches_for_mission(query, self._fetch_snapshot())
         else:
-            return self.get_assignment_summary()
+            return self.get_assignment_summary(self.sheets_service.get_missions())
+    
+    def _fetch_snapshot(self) -> DataSnapshot:
+        """Fetch missions, pilots and drones once per query"""
+        return (
+            self.sheets_service.get_missions(),
+            self.sheets_service.get_pilots(),
+            self.sheets_service.get_drones()
+        )
     
-    def suggest_assignments(self, query: str) -> str:
+    def suggest_assignments(self, query: str, snapshot: Optional[DataSnapshot] = None) -> str:
         """Suggest assignments for missions"""
-        missions = self.sheets_service.get_missions()
-        pilots = self.sheets_service.get_pilots()
-        drones = self.sheets_service.get_drones()
+        missions, pilots, drones = snapshot or self._fetch_snapshot()
         
         # Find unassigned missions
         unassigned_missions = [m for m in missions if not m.assigned_pilot]
@@ -40,16 +62,20 @@ class AssignmentTracker:
         if not unassigned_missions:
             return "All missions are currently assigned."
         
-        response = "**Assignment Suggestions**\n\n"
+        return "".join(self._iter_suggestions(unassigned_missions, pilots, drones))
+    
+    def _iter_suggestions(self, unassigned_missions: List[Mission], pilots: List[Pilot], drones: List[Drone]) -> Iterator[str]:
+        """Yield the assignment suggestions response piece by piece"""
+        yield "**Assignment Suggestions**\n\n"
         
         for mission in unassigned_missions[:3]:  # Show top 3
-            response += f"**Mission: {mission.project_id} - {mission.client}**\n"
-            response += f"Location: {mission.location}, Priority: {mission.priority}\n"
-            response += f"Dates: {mission.start_date} to {mission.end_date}\n"
-            response += f"Required: {', '.join(mission.required_skills)} | {', '.join(mission.required_certs)}\n\n"
+            yield f"**Mission: {mission.project_id} - {mission.client}**\n"
+            yield f"Location: {mission.location}, Priority: {mission.priority}\n"
+            yield f"Dates: {mission.start_date} to {mission.end_date}\n"
+            yield f"Required: {', '.join(mission.required_skills)} | {', '.join(mission.required_certs)}\n\n"
             
             # Find matching pilots
-            matching_pilots = self.matching_service.find_matching_pilots(mission, pilots)
+            matching_pilots = self.matching_service.find_matching_pilots(mission, pilots, top_k=1)
             matching_drones = self.matching_service.find_matching_drones(mission, drones)
             
             if matching_pilots and matching_drones:
@@ -57,143 +83,152 @@ class AssignmentTracker:
                 best_pilot = matching_pilots[0]
                 best_drone = matching_drones[0]
                 
-                response += f"**Suggested Assignment:**\n"
-                response += f"Pilot: {best_pilot.name} ({best_pilot.pilot_id})\n"
-                response += f"Drone: {best_drone.drone_id} ({best_drone.model})\n"
-                response += f"\nTo assign, use: `assign {mission.project_id} {best_pilot.pilot_id} {best_drone.drone_id}`\n"
+                yield f"**Suggested Assignment:**\n"
+                yield f"Pilot: {best_pilot.name} ({best_pilot.pilot_id})\n"
+                yield f"Drone: {best_drone.drone_id} ({best_drone.model})\n"
+                yield f"\nTo assign, use: `assign {mission.project_id} {best_pilot.pilot_id} {best_drone.drone_id}`\n"
             else:
-                response += f"❌ No suitable resources available for this mission.\n"
+                yield f"❌ No suitable resources available for this mission.\n"
             
-            response += "\n" + "-"*50 + "\n\n"
-        
-        return response
+            yield "\n" + "-"*50 + "\n\n"
     
-    def get_current_assignments(self) -> str:
+    def get_current_assignments(self, snapshot: Optional[DataSnapshot] = None) -> str:
         """Get current assignments"""
-        missions = self.sheets_service.get_missions()
-        pilots = self.sheets_service.get_pilots()
-        drones = self.sheets_service.get_drones()
+        missions, pilots, drones = snapshot or self._fetch_snapshot()
         
         assigned_missions = [m for m in missions if m.assigned_pilot]
         
         if not assigned_missions:
             return "No current assignments."
         
-        response = "**Current Assignments**\n\n"
+        pilots_by_id = {p.pilot_id: p for p in reversed(pilots)}
+        drones_by_id = {d.drone_id: d for d in reversed(drones)}
+        
+        parts = ["**Current Assignments**\n\n"]
         
         for mission in assigned_missions:
-            pilot = next((p for p in pilots if p.pilot_id == mission.assigned_pilot), None)
-            drone = next((d for d in drones if d.drone_id == mission.assigned_drone), None)
+            pilot = pilots_by_id.get(mission.assigned_pilot)
+            drone = drones_by_id.get(mission.assigned_drone)
             
-            response += f"**{mission.project_id} - {mission.client}**\n"
-            response += f"📍 {mission.location} | ⚡ {mission.priority}\n"
-            response += f"📅 {mission.start_date} to {mission.end_date}\n"
+            parts.append(f"**{mission.project_id} - {mission.client}**\n")
+            parts.append(f"📍 {mission.location} | ⚡ {mission.priority}\n")
+            parts.append(f"📅 {mission.start_date} to {mission.end_date}\n")
             
             if pilot:
-                response += f"👨‍✈️ Pilot: {pilot.name} ({pilot.pilot_id})\n"
+                parts.append(f"👨‍✈️ Pilot: {pilot.name} ({pilot.pilot_id})\n")
             if drone:
-                response += f"🚁 Drone: {drone.drone_id} ({drone.model})\n"
+                parts.append(f"🚁 Drone: {drone.drone_id} ({drone.model})\n")
             
-            response += "\n" + "-"*40 + "\n\n"
+            parts.append("\n" + "-"*40 + "\n\n")
         
-        return response
+        return "".join(parts)
     
-    def find_matches_for_mission(self, query: str) -> str:
+    def find_matches_for_mission(self, query: str, snapshot: Optional[DataSnapshot] = None) -> str:
         """Find matching resources for a specific mission"""
-        missions = self.sheets_service.get_missions()
-        pilots = self.sheets_service.get_pilots()
-        drones = self.sheets_service.get_drones()
+        missions, pilots, drones = snapshot or self._fetch_snapshot()
         
-        # Extract mission ID from query
-        target_mission = None
+        # Extract mission ID from query: match query tokens against project IDs first
+        query_lower = query.lower()
+        missions_by_project = {}
         for mission in missions:
-            if mission.project_id.lower() in query.lower() or mission.client.lower() in query.lower():
-                target_mission = mission
-                break
+            missions_by_project.setdefault(mission.project_id.lower(), mission)
+        
+        target_mission = next(
+            (missions_by_project[token] for token in re.findall(r"\w+", query_lower) if token in missions_by_project),
+            None
+        )
+        if not target_mission:
+            # Client names may span several words, so fall back to a substring scan
+            target_mission = next((m for m in missions if m.client.lower() in query_lower), None)
         
         if not target_mission:
             return "Please specify which mission you're looking for (e.g., 'matches for PRJ001')."
         
-        response = f"**Matching Resources for {target_mission.project_id}**\n\n"
-        response += f"Client: {target_mission.client}\n"
-        response += f"Location: {target_mission.location}\n"
-        response += f"Priority: {target_mission.priority}\n"
-        response += f"Required Skills: {', '.join(target_mission.required_skills)}\n"
-        response += f"Required Certs: {', '.join(target_mission.required_certs)}\n\n"
+        return "".join(self._iter_matches(target_mission, pilots, drones))
+    
+    def _iter_matches(self, target_mission: Mission, pilots: List[Pilot], drones: List[Drone]) -> Iterator[str]:
+        """Yield the matching resources response piece by piece"""
+        yield f"**Matching Resources for {target_mission.project_id}**\n\n"
+        yield f"Client: {target_mission.client}\n"
+        yield f"Location: {target_mission.location}\n"
+        yield f"Priority: {target_mission.priority}\n"
+        yield f"Required Skills: {', '.join(target_mission.required_skills)}\n"
+        yield f"Required Certs: {', '.join(target_mission.required_certs)}\n\n"
         
         # Find matching pilots
         matching_pilots = self.matching_service.find_matching_pilots(target_mission, pilots)
         
-        response += f"**Matching Pilots ({len(matching_pilots)})**\n"
+        yield f"**Matching Pilots ({len(matching_pilots)})**\n"
         if matching_pilots:
             for i, pilot in enumerate(matching_pilots[:5], 1):  # Show top 5
-                response += f"{i}. {pilot.name} ({pilot.pilot_id})\n"
-                response += f"   Skills: {', '.join(pilot.skills)}\n"
-                response += f"   Certs: {', '.join(pilot.certifications)}\n"
-                response += f"   Location: {pilot.location}, Status: {pilot.status}\n\n"
+                yield f"{i}. {pilot.name} ({pilot.pilot_id})\n"
+                yield f"   Skills: {', '.join(pilot.skills)}\n"
+                yield f"   Certs: {', '.join(pilot.certifications)}\n"
+                yield f"   Location: {pilot.location}, Status: {pilot.status}\n\n"
         else:
-            response += "❌ No matching pilots found.\n\n"
+            yield "❌ No matching pilots found.\n\n"
         
         # Find matching drones
         matching_drones = self.matching_service.find_matching_drones(target_mission, drones)
+        today = datetime.now().date()
         
-        response += f"**Matching Drones ({len(matching_drones)})**\n"
+        yield f"**Matching Drones ({len(matching_drones)})**\n"
         if matching_drones:
             for i, drone in enumerate(matching_drones[:5], 1):
-                response += f"{i}. {drone.drone_id} ({drone.model})\n"
-                response += f"   Capabilities: {', '.join(drone.capabilities)}\n"
-                response += f"   Location: {drone.location}, Status: {drone.status}\n"
+                yield f"{i}. {drone.drone_id} ({drone.model})\n"
+                yield f"   Capabilities: {', '.join(drone.capabilities)}\n"
+                yield f"   Location: {drone.location}, Status: {drone.status}\n"
                 if drone.maintenance_due:
-                    days_until = (drone.maintenance_due - datetime.now().date()).days
-                    response += f"   Maintenance: {drone.maintenance_due} ({days_until} days)\n"
-                response += "\n"
+                    days_until = (drone.maintenance_due - today).days
+                    yield f"   Maintenance: {drone.maintenance_due} ({days_until} days)\n"
+                yield "\n"
         else:
-            response += "❌ No matching drones found.\n"
-        
-        return response
+            yield "❌ No matching drones found.\n"
     
-    def get_assignment_summary(self) -> str:
+    def get_assignment_summary(self, missions: Optional[List[Mission]] = None, today: Optional[date] = None) -> str:
         """Get assignment summary"""
-        missions = self.sheets_service.get_missions()
-        
-        assigned_count = sum(1 for m in missions if m.assigned_pilot)
-        unassigned_count = len(missions) - assigned_count
-        
-        # Group by priority
-        priority_groups = {}
+        if missions is None:
+            missions = self.sheets_service.get_missions()
+        if today is None:
+            today = datetime.now().date()
+        
+        # Tally totals by priority and collect upcoming unassigned missions in one pass
+        total_by_priority = Counter()
+        assigned_by_priority = Counter()
+        upcoming_missions = []
+        assigned_count = 0
         for mission in missions:
-            priority_groups.setdefault(mission.priority, {"total": 0, "assigned": 0})
-            priority_groups[mission.priority]["total"] += 1
+            total_by_priority[mission.priority] += 1
             if mission.assigned_pilot:
-                priority_groups[mission.priority]["assigned"] += 1
+                assigned_by_priority[mission.priority] += 1
+                assigned_count += 1
+            elif mission.start_date >= today:
+                upcoming_missions.append(mission)
         
-        response = "**Assignment Summary**\n\n"
-        response += f"Total Missions: {len(missions)}\n"
-        response += f"Assigned: {assigned_count}\n"
-        response += f"Unassigned: {unassigned_count}\n\n"
+        unassigned_count = len(missions) - assigned_count
+        
+        parts = ["**Assignment Summary**\n\n"]
+        parts.append(f"Total Missions: {len(missions)}\n")
+        parts.append(f"Assigned: {assigned_count}\n")
+        parts.append(f"Unassigned: {unassigned_count}\n\n")
         
-        response += "**By Priority:**\n"
+        parts.append("**By Priority:**\n")
         for priority in ["Urgent", "High", "Standard", "Low"]:
-            if priority in priority_groups:
-                data = priority_groups[priority]
-                assigned_pct = (data["assigned"] / data["total"]) * 100 if data["total"] > 0 else 0
-                response += f"{priority}: {data['assigned']}/{data['total']} ({assigned_pct:.0f}% assigned)\n"
+            if priority in total_by_priority:
+                total = total_by_priority[priority]
+                assigned = assigned_by_priority[priority]
+                assigned_pct = (assigned / total) * 100 if total > 0 else 0
+                parts.append(f"{priority}: {assigned}/{total} ({assigned_pct:.0f}% assigned)\n")
         
         # Upcoming assignments
-        today = datetime.now().date()
-        upcoming_missions = [
-            m for m in missions 
-            if not m.assigned_pilot and m.start_date >= today
-        ]
-        
         if upcoming_missions:
             upcoming_missions.sort(key=lambda x: x.start_date)
-            response += "\n**Upcoming Unassigned Missions:**\n"
+            parts.append("\n**Upcoming Unassigned Missions:**\n")
             for mission in upcoming_missions[:3]:
                 days_until = (mission.start_date - today).days
-                response += f"- {mission.project_id}: Starts in {days_until} days ({mission.start_date})\n"
+                parts.append(f"- {mission.project_id}: Starts in {days_until} days ({mission.start_date})\n")
         
-        return response
+        return "".join(parts)
     
     def create_assignment(self, project_id: str, pilot_id: str, drone_id: str) -> Dict[str, Any]:
         """Create a new assignment"""
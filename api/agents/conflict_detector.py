@@ -1,5 +1,6 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
+from collections import defaultdict
 from datetime import datetime, date
 
 from api.services.sheets_service import SheetsService
@@ -9,102 +10,144 @@ from api.models.mission import Mission
 
 logger = logging.getLogger(__name__)
 
+def _find_overlap_pairs(starts: List[int], ends: List[int]) -> List[Tuple[int, int]]:
+    """Return index pairs of overlapping [start, end] day ordinals, earlier start first"""
+    pairs = []
+    active = []
+    
+    for j in sorted(range(len(starts)), key=starts.__getitem__):
+        start = starts[j]
+        # Drop intervals that ended before this one starts
+        active = [i for i in active if ends[i] >= start]
+        for i in active:
+            pairs.append((i, j))
+        active.append(j)
+    
+    return pairs
+
 class ConflictDetector:
     """Agent for detecting conflicts in assignments"""
     
     def __init__(self, sheets_service: SheetsService):
         self.sheets_service = sheets_service
+        self._model_sets: Dict[str, Tuple[list, Dict[int, Tuple[frozenset, frozenset]]]] = {}
+    
+    def _get_model_sets(self, name: str, records: list, fields: Tuple[str, str]) -> Dict[int, Tuple[frozenset, frozenset]]:
+        """Frozensets of two list fields for each record (keyed by id), rebuilt only when a different list is passed"""
+        cached = self._model_sets.get(name)
+        if cached is None or cached[0] is not records:
+            cached = (records, {id(r): (frozenset(getattr(r, fields[0])), frozenset(getattr(r, fields[1]))) for r in records})
+            self._model_sets[name] = cached
+        return cached[1]
     
     def detect_all_conflicts(self) -> List[Dict[str, Any]]:
         """Detect all conflicts in the system"""
         conflicts = []
         
-        # Get all data
-        missions = self.sheets_service.get_missions()
-        pilots = self.sheets_service.get_pilots()
-        drones = self.sheets_service.get_drones()
-        
-        # Check each mission for conflicts
-        for mission in missions:
-            if mission.assigned_pilot and mission.assigned_drone:
-                # Check assignment conflicts
-                mission_conflicts = self.check_assignment_conflicts(
-                    mission, 
-                    next((p for p in pilots if p.pilot_id == mission.assigned_pilot), None),
-                    next((d for d in drones if d.drone_id == mission.assigned_drone), None)
-                )
-                conflicts.extend(mission_conflicts)
+        # Get all data, refetching any stale sheets in one batch
+        missions, pilots, drones = self.sheets_service.get_all_data()
         
-        # Check for double bookings
-        conflicts.extend(self.check_double_bookings(missions, pilots, drones))
+        # Index resources by ID once for O(1) lookups; built in reverse so the first row wins on duplicate IDs
+        pilots_by_id = {p.pilot_id: p for p in reversed(pilots)}
+        drones_by_id = {d.drone_id: d for d in reversed(drones)}
         
-        # Check for maintenance conflicts
-        conflicts.extend(self.check_maintenance_conflicts(drones, missions))
+        # Requirement and qualification sets, reused across sweeps until the sheet data changes
+        mission_sets = self._get_model_sets("missions", missions, ("required_skills", "required_certs"))
+        pilot_sets = self._get_model_sets("pilots", pilots, ("skills", "certifications"))
         
-        # Check for certification conflicts
-        conflicts.extend(self.check_certification_conflicts(missions, pilots))
+        # Check each mission for conflicts and group missions by resource in a single pass
+        today = datetime.now().date()
+        missions_by_pilot = defaultdict(list)
+        missions_by_drone = defaultdict(list)
+        for mission in missions:
+            pilot = None
+            drone = None
+            qualifications = None
+            if mission.assigned_pilot:
+                missions_by_pilot[mission.assigned_pilot].append(mission)
+                pilot = pilots_by_id.get(mission.assigned_pilot)
+                if pilot:
+                    qualifications = pilot_sets[id(pilot)]
+            if mission.assigned_drone:
+                missions_by_drone[mission.assigned_drone].append(mission)
+                drone = drones_by_id.get(mission.assigned_drone)
+            conflicts.extend(self._check_mission(mission, pilot, drone, today, mission_sets[id(mission)], qualifications))
         
-        # Check for location mismatches
-        conflicts.extend(self.check_location_mismatches(missions, pilots, drones))
+        # Check for double bookings (cross-mission, so kept as its own pass)
+        conflicts.extend(self.check_double_bookings(missions_by_pilot, missions_by_drone, pilots_by_id))
         
         return conflicts
     
     def check_assignment_conflicts(self, mission: Mission, pilot: Pilot, drone: Drone) -> List[Dict[str, Any]]:
         """Check conflicts for a specific assignment"""
-        conflicts = []
-        
         if not pilot or not drone:
-            return conflicts
-        
-        # 1. Check if pilot has required skills
-        mission_skills = set(mission.required_skills)
-        pilot_skills = set(pilot.skills)
-        missing_skills = mission_skills - pilot_skills
-        
-        if missing_skills:
-            conflicts.append({
-                "type": "skill_mismatch",
-                "severity": "high",
-                "message": f"Pilot {pilot.name} ({pilot.pilot_id}) lacks required skills: {', '.join(missing_skills)} for mission {mission.project_id}"
-            })
+            return []
         
-        # 2. Check if pilot has required certifications
-        mission_certs = set(mission.required_certs)
-        pilot_certs = set(pilot.certifications)
-        missing_certs = mission_certs - pilot_certs
-        
-        if missing_certs:
-            conflicts.append({
-                "type": "certification_mismatch",
-                "severity": "high",
-                "message": f"Pilot {pilot.name} lacks required certifications: {', '.join(missing_certs)} for mission {mission.project_id}"
-            })
-        
-        # 3. Check location mismatch
-        if pilot.location != mission.location:
-            conflicts.append({
-                "type": "location_mismatch",
-                "severity": "medium",
-                "message": f"Pilot {pilot.name} is in {pilot.location}, but mission {mission.project_id} is in {mission.location}"
-            })
-        
-        if drone.location != mission.location:
-            conflicts.append({
-                "type": "location_mismatch",
-                "severity": "medium",
-                "message": f"Drone {drone.drone_id} is in {drone.location}, but mission {mission.project_id} is in {mission.location}"
-            })
-        
-        # 4. Check drone maintenance
-        if drone.maintenance_due and drone.maintenance_due <= mission.end_date:
-            conflicts.append({
-                "type": "maintenance_conflict",
-                "severity": "high",
-                "message": f"Drone {drone.drone_id} requires maintenance on {drone.maintenance_due}, during mission {mission.project_id}"
-            })
+        return self._check_mission(
+            mission, pilot, drone, datetime.now().date(),
+            (frozenset(mission.required_skills), frozenset(mission.required_certs)),
+            (frozenset(pilot.skills), frozenset(pilot.certifications))
+        )
+    
+    def _check_mission(self, mission: Mission, pilot: Optional[Pilot], drone: Optional[Drone], today: date,
+                       requirements: Tuple[frozenset, frozenset],
+                       qualifications: Optional[Tuple[frozenset, frozenset]]) -> List[Dict[str, Any]]:
+        """Run every per-mission check against whichever resources are assigned, as of the given day;
+        skill and availability checks need both a pilot and a drone, the rest need only their own resource.
+        requirements and qualifications are the mission's and pilot's (skills, certifications) sets"""
+        conflicts = []
+        fully_assigned = pilot is not None and drone is not None
+        
+        if pilot:
+            # 1. Check if pilot has required skills
+            if fully_assigned:
+                missing_skills = requirements[0] - qualifications[0]
+                
+                if missing_skills:
+                    conflicts.append({
+                        "type": "skill_mismatch",
+                        "severity": "high",
+                        "message": f"Pilot {pilot.name} ({pilot.pilot_id}) lacks required skills: {', '.join(missing_skills)} for mission {mission.project_id}"
+                    })
+            
+            # 2. Check if pilot has required certifications
+            missing_certs = requirements[1] - qualifications[1]
+            
+            if missing_certs:
+                conflicts.append({
+                    "type": "certification_mismatch",
+                    "severity": "high",
+                    "message": f"Pilot {pilot.name} lacks required certifications: {', '.join(missing_certs)} for mission {mission.project_id}"
+                })
+            
+            # 3. Check location mismatch
+            if pilot.location != mission.location:
+                conflicts.append({
+                    "type": "location_mismatch",
+                    "severity": "medium",
+                    "message": f"Pilot {pilot.name} is in {pilot.location}, but mission {mission.project_id} is in {mission.location}"
+                })
+        
+        if drone:
+            if drone.location != mission.location:
+                conflicts.append({
+                    "type": "location_mismatch",
+                    "severity": "medium",
+                    "message": f"Drone {drone.drone_id} is in {drone.location}, but mission {mission.project_id} is in {mission.location}"
+                })
+            
+            # 4. Check drone maintenance
+            if drone.maintenance_due and drone.maintenance_due <= mission.end_date:
+                days_until = (drone.maintenance_due - today).days
+                status = "OVERDUE" if days_until < 0 else f"due in {days_until} days"
+                conflicts.append({
+                    "type": "maintenance_conflict",
+                    "severity": "high",
+                    "message": f"Drone {drone.drone_id} requires maintenance on {drone.maintenance_due} ({status}), during mission {mission.project_id}"
+                })
         
         # 5. Check pilot availability
-        if pilot.available_from and pilot.available_from > mission.start_date:
+        if fully_assigned and pilot.available_from and pilot.available_from > mission.start_date:
             conflicts.append({
                 "type": "availability_conflict",
                 "severity": "high",
@@ -113,120 +156,34 @@ class ConflictDetector:
         
         return conflicts
     
-    def check_double_bookings(self, missions: List[Mission], pilots: List[Pilot], drones: List[Drone]) -> List[Dict[str, Any]]:
+    def check_double_bookings(self, missions_by_pilot: Dict[str, List[Mission]],
+                              missions_by_drone: Dict[str, List[Mission]],
+                              pilots_by_id: Dict[str, Pilot]) -> List[Dict[str, Any]]:
         """Check for double bookings of pilots and drones"""
         conflicts = []
         
         # Check pilot double bookings
-        pilot_assignments = {}
-        for mission in missions:
-            if mission.assigned_pilot:
-                pilot_assignments.setdefault(mission.assigned_pilot, []).append(mission)
-        
-        for pilot_id, assigned_missions in pilot_assignments.items():
+        for pilot_id, assigned_missions in missions_by_pilot.items():
             if len(assigned_missions) > 1:
                 # Check for overlapping dates
-                for i in range(len(assigned_missions)):
-                    for j in range(i + 1, len(assigned_missions)):
-                        m1 = assigned_missions[i]
-                        m2 = assigned_missions[j]
-                        
-                        if self._dates_overlap(m1.start_date, m1.end_date, m2.start_date, m2.end_date):
-                            pilot = next((p for p in pilots if p.pilot_id == pilot_id), None)
-                            pilot_name = pilot.name if pilot else pilot_id
-                            
-                            conflicts.append({
-                                "type": "double_booking",
-                                "severity": "critical",
-                                "message": f"Pilot {pilot_name} double-booked on overlapping missions: {m1.project_id} ({m1.start_date}-{m1.end_date}) and {m2.project_id} ({m2.start_date}-{m2.end_date})"
-                            })
-        
-        # Check drone double bookings
-        drone_assignments = {}
-        for mission in missions:
-            if mission.assigned_drone:
-                drone_assignments.setdefault(mission.assigned_drone, []).append(mission)
-        
-        for drone_id, assigned_missions in drone_assignments.items():
-            if len(assigned_missions) > 1:
-                for i in range(len(assigned_missions)):
-                    for j in range(i + 1, len(assigned_missions)):
-                        m1 = assigned_missions[i]
-                        m2 = assigned_missions[j]
-                        
-                        if self._dates_overlap(m1.start_date, m1.end_date, m2.start_date, m2.end_date):
-                            conflicts.append({
-                                "type": "double_booking",
-                                "severity": "critical",
-                                "message": f"Drone {drone_id} double-booked on overlapping missions: {m1.project_id} and {m2.project_id}"
-                            })
-        
-        return conflicts
-    
-    def check_maintenance_conflicts(self, drones: List[Drone], missions: List[Mission]) -> List[Dict[str, Any]]:
-        """Check for maintenance conflicts"""
-        conflicts = []
-        today = datetime.now().date()
-        
-        for drone in drones:
-            if drone.maintenance_due:
-                # Check if drone is assigned during maintenance period
-                for mission in missions:
-                    if mission.assigned_drone == drone.drone_id:
-                        if drone.maintenance_due <= mission.end_date:
-                            days_until = (drone.maintenance_due - today).days
-                            status = "OVERDUE" if days_until < 0 else f"due in {days_until} days"
-                            
-                            conflicts.append({
-                                "type": "maintenance_conflict",
-                                "severity": "high",
-                                "message": f"Drone {drone.drone_id} assigned to {mission.project_id} during maintenance period (maintenance {status}: {drone.maintenance_due})"
-                            })
-        
-        return conflicts
-    
-    def check_certification_conflicts(self, missions: List[Mission], pilots: List[Pilot]) -> List[Dict[str, Any]]:
-        """Check for certification conflicts"""
-        conflicts = []
-        
-        for mission in missions:
-            if mission.assigned_pilot:
-                pilot = next((p for p in pilots if p.pilot_id == mission.assigned_pilot), None)
-                if pilot:
-                    mission_certs = set(mission.required_certs)
-                    pilot_certs = set(pilot.certifications)
-                    missing_certs = mission_certs - pilot_certs
+                for m1, m2 in self._find_overlapping_missions(assigned_missions):
+                    pilot = pilots_by_id.get(pilot_id)
+                    pilot_name = pilot.name if pilot else pilot_id
                     
-                    if missing_certs:
-                        conflicts.append({
-                            "type": "certification_mismatch",
-                            "severity": "high",
-                            "message": f"Pilot {pilot.name} assigned to {mission.project_id} lacks certifications: {', '.join(missing_certs)}"
-                        })
-        
-        return conflicts
-    
-    def check_location_mismatches(self, missions: List[Mission], pilots: List[Pilot], drones: List[Drone]) -> List[Dict[str, Any]]:
-        """Check for location mismatches"""
-        conflicts = []
-        
-        for mission in missions:
-            if mission.assigned_pilot:
-                pilot = next((p for p in pilots if p.pilot_id == mission.assigned_pilot), None)
-                if pilot and pilot.location != mission.location:
                     conflicts.append({
-                        "type": "location_mismatch",
-                        "severity": "medium",
-                        "message": f"Pilot {pilot.name} in {pilot.location} assigned to mission in {mission.location} ({mission.project_id})"
+                        "type": "double_booking",
+                        "severity": "critical",
+                        "message": f"Pilot {pilot_name} double-booked on overlapping missions: {m1.project_id} ({m1.start_date}-{m1.end_date}) and {m2.project_id} ({m2.start_date}-{m2.end_date})"
                     })
-            
-            if mission.assigned_drone:
-                drone = next((d for d in drones if d.drone_id == mission.assigned_drone), None)
-                if drone and drone.location != mission.location:
+        
+        # Check drone double bookings
+        for drone_id, assigned_missions in missions_by_drone.items():
+            if len(assigned_missions) > 1:
+                for m1, m2 in self._find_overlapping_missions(assigned_missions):
                     conflicts.append({
-                        "type": "location_mismatch",
-                        "severity": "medium",
-                        "message": f"Drone {drone.drone_id} in {drone.location} assigned to mission in {mission.location} ({mission.project_id})"
+                        "type": "double_booking",
+                        "severity": "critical",
+                        "message": f"Drone {drone_id} double-booked on overlapping missions: {m1.project_id} and {m2.project_id}"
                     })
         
         return conflicts
@@ -246,20 +203,18 @@ class ConflictDetector:
         
         if len(assigned_missions) > 1:
             # Check for overlapping dates
-            for i in range(len(assigned_missions)):
-                for j in range(i + 1, len(assigned_missions)):
-                    m1 = assigned_missions[i]
-                    m2 = assigned_missions[j]
-                    
-                    if self._dates_overlap(m1.start_date, m1.end_date, m2.start_date, m2.end_date):
-                        conflicts.append({
-                            "type": "double_booking",
-                            "severity": "critical",
-                            "message": f"Pilot {pilot.name} has overlapping assignments: {m1.project_id} and {m2.project_id}"
-                        })
+            for m1, m2 in self._find_overlapping_missions(assigned_missions):
+                conflicts.append({
+                    "type": "double_booking",
+                    "severity": "critical",
+                    "message": f"Pilot {pilot.name} has overlapping assignments: {m1.project_id} and {m2.project_id}"
+                })
         
         return conflicts
     
-    def _dates_overlap(self, start1: date, end1: date, start2: date, end2: date) -> bool:
-        """Check if two date ranges overlap"""
-        return start1 <= end2 and start2 <= end1
\ No newline at end of file
+    def _find_overlapping_missions(self, missions: List[Mission]) -> List[Tuple[Mission, Mission]]:
+        """Find all pairs of missions with overlapping dates using a sweep over start dates"""
+        starts = [m.start_date.toordinal() for m in missions]
+        ends = [m.end_date.toordinal() for m in missions]
+        
+        return [(missions[i], missions[j]) for i, j in _find_overlap_pairs(starts, ends)]
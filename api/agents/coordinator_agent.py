@@ -1,5 +1,10 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, Tuple
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
 from datetime import datetime
 
 from api.services.sheets_service import SheetsService
@@ -16,6 +21,128 @@ from api.models.drone import Drone
 
 logger = logging.getLogger(__name__)
 
+# Pilot statuses that can be set from a chat message
+PILOT_STATUS_KEYWORDS = {
+    'on leave': 'On Leave',
+    'unavailable': 'Unavailable',
+    'available': 'Available',
+    'assigned': 'Assigned'
+}
+
+# Candidate project ID tokens in a chat message
+_ID_TOKEN_PATTERN = re.compile(r"[\w-]+")
+
+_STATUS_PATTERN = re.compile(r"\b(" + "|".join(map(re.escape, PILOT_STATUS_KEYWORDS)) + r")\b")
+
+# How often the background conflict scan reruns when nothing has changed
+CONFLICT_REFRESH_SECONDS = 30
+
+# Chat intents that write to the sheets; these always run and are never served from cache
+_MUTATING_INTENTS = frozenset({'update_pilot_status', 'urgent_assignment'})
+
+# Size and lifetime of the chat response cache
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_TTL_SECONDS = 30
+
+# Number of recent user/assistant messages kept in conversation context
+CONVERSATION_CONTEXT_LIMIT = 200
+
+# Numeric rank of each mission priority, highest first
+PRIORITY_LEVELS = {
+    "Urgent": 4,
+    "High": 3,
+    "Standard": 2,
+    "Low": 1
+}
+
+# Keyword categories used by _parse_intent; the lookahead lets finditer report
+# overlapping keywords, matching the original substring checks
+_KEYWORD_PATTERN = re.compile(
+    r"(?=(?P<pilot>pilot|roster|availability)"
+    r"|(?P<drone>drone|fleet|inventory)"
+    r"|(?P<assign>assign|mission|project)"
+    r"|(?P<conflict>conflict|problem|issue|warning)"
+    r"|(?P<help>help|what can|how to)"
+    r"|(?P<status>status|update)"
+    r"|(?P<available>available)"
+    r"|(?P<maintenance>maintenance)"
+    r"|(?P<urgent>urgent|emergency))"
+)
+
+@lru_cache(maxsize=2048)
+def _parse_intent_cached(lower_input: str) -> str:
+    """Map lowercased user input to an intent; pure, so results are memoized"""
+    # One scan records every keyword category present in the input
+    found = {match.lastgroup for match in _KEYWORD_PATTERN.finditer(lower_input)}
+    
+    # Roster management intents
+    if 'pilot' in found:
+        if 'status' in found:
+            return 'update_pilot_status'
+        elif 'available' in found:
+            return 'check_pilot_availability'
+        else:
+            return 'roster_query'
+    
+    # Drone inventory intents
+    elif 'drone' in found:
+        if 'maintenance' in found:
+            return 'check_maintenance'
+        elif 'available' in found:
+            return 'check_drone_availability'
+        else:
+            return 'drone_query'
+    
+    # Assignment intents
+    elif 'assign' in found:
+        if 'urgent' in found:
+            return 'urgent_assignment'
+        else:
+            return 'assignment_query'
+    
+    # Conflict detection intents
+    elif 'conflict' in found:
+        return 'check_conflicts'
+    
+    # General help
+    elif 'help' in found:
+        return 'help'
+    
+    # Default to general conversation
+    else:
+        return 'general_query'
+
+
+class _NameIndex:
+    """Finds the first item (in list order) whose name keys occur in a text, with one regex scan"""
+    
+    def __init__(self, items: list, keys_for: Callable[[Any], Tuple[str, ...]]):
+        self.items = items
+        
+        first_index = {}
+        for i, item in enumerate(items):
+            for key in keys_for(item):
+                first_index.setdefault(key, i)
+        
+        # The scan reports the longest key at each position; every shorter key that
+        # prefixes it matched there too, so fold their positions in up front
+        self._best_index = {
+            key: min(first_index[key[:n]] for n in range(len(key) + 1) if key[:n] in first_index)
+            for key in first_index
+        }
+        
+        keys = sorted(first_index, key=len, reverse=True)
+        self._pattern = re.compile("(?=(" + "|".join(map(re.escape, keys)) + "))") if keys else None
+    
+    def first_match(self, text_lower: str) -> Optional[Any]:
+        """Return the earliest listed item named in the already-lowercased text"""
+        if self._pattern is None:
+            return None
+        
+        best = min((self._best_index[m.group(1)] for m in self._pattern.finditer(text_lower)), default=None)
+        return self.items[best] if best is not None else None
+
+
 class CoordinatorAgent:
     """Main coordinator agent that orchestrates all operations"""
     
@@ -29,8 +156,39 @@ class CoordinatorAgent:
         self.assignment_tracker = AssignmentTracker(sheets_service, matching_service)
         self.conflict_detector = ConflictDetector(sheets_service)
         
-        # Conversation context
-        self.conversation_context = []
+        # Name lookups over the most recently seen pilot and mission lists
+        self._pilot_index = None
+        self._mission_index = None
+        self._mission_ids = None
+        
+        # Conflicts are detected on a background thread (started by the app) and served from this
+        # cache as (sheet data version, conflicts)
+        self._conflict_cache = None
+        self._conflict_lock = threading.Lock()
+        self._conflict_refresh = threading.Event()
+        self._conflict_stop = threading.Event()
+        self._conflict_thread = None
+        
+        # Intent -> handler dispatch table
+        self._handlers = {
+            'update_pilot_status': self._handle_pilot_status_update,
+            'check_pilot_availability': self.roster_manager.get_availability_report,
+            'roster_query': self.roster_manager.handle_query,
+            'check_maintenance': lambda user_input: self.inventory_manager.get_maintenance_report(),
+            'check_drone_availability': self.inventory_manager.get_availability_report,
+            'drone_query': self.inventory_manager.handle_query,
+            'urgent_assignment': self._handle_urgent_assignment,
+            'assignment_query': self.assignment_tracker.handle_query,
+            'check_conflicts': self._handle_conflict_check,
+            'help': lambda user_input: self._get_help_message(),
+        }
+        
+        # Recent read-only chat answers: normalized query -> (data version, time, response)
+        self._response_cache = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        
+        # Conversation context, keeping only the most recent messages
+        self.conversation_context = deque(maxlen=CONVERSATION_CONTEXT_LIMIT)
         
     def process_query(self, user_input: str) -> str:
         """Process user query and return appropriate response"""
@@ -45,8 +203,11 @@ class CoordinatorAgent:
             # Parse user intent
             intent = self._parse_intent(user_input)
             
-            # Route to appropriate handler
-            response = self._route_to_handler(intent, user_input)
+            # Route to appropriate handler; read-only answers are reused for repeated questions
+            if intent in _MUTATING_INTENTS:
+                response = self._route_to_handler(intent, user_input)
+            else:
+                response = self._get_cached_response(intent, user_input)
             
             # Store assistant response
             self.conversation_context.append({
@@ -61,13 +222,36 @@ class CoordinatorAgent:
             logger.error(f"Error processing query: {e}")
             return "I encountered an error processing your request. Please try again."
     
+    def _get_cached_response(self, intent: str, user_input: str) -> str:
+        """Answer a read-only query from the response cache while the sheet data is unchanged"""
+        key = user_input.strip().lower()
+        now = time.monotonic()
+        data_version = self.sheets_service.data_version
+        
+        with self._response_cache_lock:
+            cached = self._response_cache.get(key)
+            if cached and cached[0] == data_version and now - cached[1] < RESPONSE_CACHE_TTL_SECONDS:
+                self._response_cache.move_to_end(key)
+                return cached[2]
+        
+        response = self._route_to_handler(intent, user_input)
+        
+        with self._response_cache_lock:
+            self._response_cache[key] = (data_version, now, response)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        
+        return response
+    
     def assign_mission(self, project_id: str, pilot_id: str, drone_id: str) -> Dict[str, Any]:
         """Assign pilot and drone to a mission"""
         try:
-            # Get mission, pilot, and drone
-            mission = self.sheets_service.get_mission(project_id)
-            pilot = self.sheets_service.get_pilot(pilot_id)
-            drone = self.sheets_service.get_drone(drone_id)
+            # Get mission, pilot, and drone from one read of all sheets
+            missions, pilots, drones = self.sheets_service.get_all_data()
+            mission = next((m for m in missions if m.project_id == project_id), None)
+            pilot = next((p for p in pilots if p.pilot_id == pilot_id), None)
+            drone = next((d for d in drones if d.drone_id == drone_id), None)
             
             if not mission:
                 return {"success": False, "error": f"Mission {project_id} not found"}
@@ -76,168 +260,187 @@ class CoordinatorAgent:
             if not drone:
                 return {"success": False, "error": f"Drone {drone_id} not found"}
             
-            # Check for conflicts
-            conflicts = self.conflict_detector.check_assignment_conflicts(
-                mission, pilot, drone
-            )
-            
-            if conflicts:
-                conflict_messages = "\n".join([c["message"] for c in conflicts])
-                return {
-                    "success": False, 
-                    "error": f"Assignment conflicts detected:\n{conflict_messages}"
-                }
-            
-            # Perform assignment
-            success = self.sheets_service.assign_to_mission(project_id, pilot_id, drone_id)
-            
-            if success:
-                return {
-                    "success": True,
-                    "assignment": {
-                        "project_id": project_id,
-                        "pilot_id": pilot_id,
-                        "drone_id": drone_id,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                }
-            else:
-                return {"success": False, "error": "Failed to update assignment in sheets"}
+            return self._assign_resources(mission, pilot, drone)
                 
         except Exception as e:
             logger.error(f"Error assigning mission: {e}")
             return {"success": False, "error": str(e)}
     
+    def _assign_resources(self, mission: Mission, pilot: Pilot, drone: Drone) -> Dict[str, Any]:
+        """Check conflicts and assign already-loaded pilot and drone to a mission"""
+        # Check for conflicts
+        conflicts = self.conflict_detector.check_assignment_conflicts(
+            mission, pilot, drone
+        )
+        
+        if conflicts:
+            conflict_messages = "\n".join([c["message"] for c in conflicts])
+            return {
+                "success": False, 
+                "error": f"Assignment conflicts detected:\n{conflict_messages}"
+            }
+        
+        # Perform assignment
+        success = self.sheets_service.assign_to_mission(mission.project_id, pilot.pilot_id, drone.drone_id)
+        
+        if success:
+            self._conflict_refresh.set()
+            return {
+                "success": True,
+                "assignment": {
+                    "project_id": mission.project_id,
+                    "pilot_id": pilot.pilot_id,
+                    "drone_id": drone.drone_id,
+                    "timestamp": datetime.now().isoformat()
+                }
+            }
+        else:
+            return {"success": False, "error": "Failed to update assignment in sheets"}
+    
     def handle_urgent_reassignment(self, urgent_mission_id: str) -> Dict[str, Any]:
         """Handle urgent reassignment for a mission"""
         try:
-            urgent_mission = self.sheets_service.get_mission(urgent_mission_id)
+            # Get all current assignments in one batched read
+            missions, pilots, drones = self.sheets_service.get_all_data()
+            urgent_mission = next((m for m in missions if m.project_id == urgent_mission_id), None)
             if not urgent_mission:
                 return {"success": False, "error": "Urgent mission not found"}
             
-            # Get all current assignments
-            missions = self.sheets_service.get_missions()
-            pilots = self.sheets_service.get_pilots()
-            drones = self.sheets_service.get_drones()
-            
             # Find resources that can be reassigned
-            available_pilots = self.matching_service.find_matching_pilots(urgent_mission, pilots)
+            available_pilots = self.matching_service.find_matching_pilots(urgent_mission, pilots, top_k=1)
             available_drones = self.matching_service.find_matching_drones(urgent_mission, drones)
             
             if not available_pilots or not available_drones:
                 # Try to find resources that could be reassigned from lower priority missions
                 return self._find_reassignment_options(urgent_mission, missions, pilots, drones)
             
-            # Assign available resources
+            # Assign available resources; they were just loaded, so skip re-fetching them
             best_pilot = available_pilots[0]
             best_drone = available_drones[0]
             
-            result = self.assign_mission(
-                urgent_mission_id, 
-                best_pilot.pilot_id, 
-                best_drone.drone_id
-            )
-            
-            return result
+            return self._assign_resources(urgent_mission, best_pilot, best_drone)
             
         except Exception as e:
             logger.error(f"Error handling urgent reassignment: {e}")
             return {"success": False, "error": str(e)}
     
+    def handle_urgent_reassignments(self, urgent_mission_ids: List[str]) -> Dict[str, Any]:
+        """Handle several urgent missions at once, assigning resources jointly rather than greedily"""
+        if len(urgent_mission_ids) == 1:
+            return {urgent_mission_ids[0]: self.handle_urgent_reassignment(urgent_mission_ids[0])}
+        
+        try:
+            missions, pilots, drones = self.sheets_service.get_all_data()
+            missions_by_id = {m.project_id: m for m in reversed(missions)}
+            
+            results = {}
+            urgent_missions = []
+            for mission_id in urgent_mission_ids:
+                mission = missions_by_id.get(mission_id)
+                if mission:
+                    urgent_missions.append(mission)
+                else:
+                    results[mission_id] = {"success": False, "error": "Urgent mission not found"}
+            
+            assignments = self.matching_service.assign_missions_batch(urgent_missions, pilots, drones)
+            
+            for mission in urgent_missions:
+                pilot, drone = assignments[mission.project_id]
+                if pilot and drone:
+                    results[mission.project_id] = self._assign_resources(mission, pilot, drone)
+                else:
+                    results[mission.project_id] = self._find_reassignment_options(mission, missions, pilots, drones)
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error handling urgent reassignments: {e}")
+            return {mission_id: {"success": False, "error": str(e)} for mission_id in urgent_mission_ids}
+    
     def _parse_intent(self, user_input: str) -> str:
         """Parse user intent from input"""
-        user_input = user_input.lower()
-        
-        # Roster management intents
-        if any(word in user_input for word in ['pilot', 'roster', 'availability']):
-            if 'status' in user_input or 'update' in user_input:
-                return 'update_pilot_status'
-            elif 'available' in user_input:
-                return 'check_pilot_availability'
-            else:
-                return 'roster_query'
-        
-        # Drone inventory intents
-        elif any(word in user_input for word in ['drone', 'fleet', 'inventory']):
-            if 'maintenance' in user_input:
-                return 'check_maintenance'
-            elif 'available' in user_input:
-                return 'check_drone_availability'
-            else:
-                return 'drone_query'
-        
-        # Assignment intents
-        elif any(word in user_input for word in ['assign', 'mission', 'project']):
-            if 'urgent' in user_input or 'emergency' in user_input:
-                return 'urgent_assignment'
-            else:
-                return 'assignment_query'
-        
-        # Conflict detection intents
-        elif any(word in user_input for word in ['conflict', 'problem', 'issue', 'warning']):
-            return 'check_conflicts'
-        
-        # General help
-        elif any(word in user_input for word in ['help', 'what can', 'how to']):
-            return 'help'
-        
-        # Default to general conversation
-        else:
-            return 'general_query'
+        return _parse_intent_cached(user_input.lower())
     
     def _route_to_handler(self, intent: str, user_input: str) -> str:
         """Route query to appropriate handler"""
-        if intent == 'update_pilot_status':
-            return self._handle_pilot_status_update(user_input)
-        elif intent == 'check_pilot_availability':
-            return self.roster_manager.get_availability_report(user_input)
-        elif intent == 'roster_query':
-            return self.roster_manager.handle_query(user_input)
-        elif intent == 'check_maintenance':
-            return self.inventory_manager.get_maintenance_report()
-        elif intent == 'check_drone_availability':
-            return self.inventory_manager.get_availability_report(user_input)
-        elif intent == 'drone_query':
-            return self.inventory_manager.handle_query(user_input)
-        elif intent == 'urgent_assignment':
-            return self._handle_urgent_assignment(user_input)
-        elif intent == 'assignment_query':
-            return self.assignment_tracker.handle_query(user_input)
-        elif intent == 'check_conflicts':
-            conflicts = self.conflict_detector.detect_all_conflicts()
-            if conflicts:
-                return "I found the following conflicts:\n" + "\n".join([c["message"] for c in conflicts])
-            else:
-                return "No conflicts detected in the system."
-        elif intent == 'help':
-            return self._get_help_message()
+        return self._handlers.get(intent, self._handle_general_query)(user_input)
+    
+    def _handle_conflict_check(self, user_input: str) -> str:
+        """Handle conflict check requests"""
+        conflicts = self.get_cached_conflicts()
+        if conflicts:
+            return "I found the following conflicts:\n" + "\n".join([c["message"] for c in conflicts])
         else:
-            return self._handle_general_query(user_input)
+            return "No conflicts detected in the system."
+    
+    def get_cached_conflicts(self) -> List[Dict[str, Any]]:
+        """Get the most recent conflict scan, rerunning it inline if the sheet data changed since"""
+        with self._conflict_lock:
+            cached = self._conflict_cache
+        
+        if cached is None or cached[0] != self.sheets_service.data_version:
+            return self._recompute_conflicts()
+        return cached[1]
+    
+    def _recompute_conflicts(self) -> List[Dict[str, Any]]:
+        """Run a full conflict scan and cache it against the data version it started from"""
+        data_version = self.sheets_service.data_version
+        conflicts = self.conflict_detector.detect_all_conflicts()
+        with self._conflict_lock:
+            self._conflict_cache = (data_version, conflicts)
+        return conflicts
+    
+    def start_conflict_refresh(self):
+        """Start the background conflict scan thread if it is not already running"""
+        if self._conflict_thread is not None and self._conflict_thread.is_alive():
+            return
+        self._conflict_stop.clear()
+        self._conflict_thread = threading.Thread(target=self._refresh_conflicts_loop, daemon=True)
+        self._conflict_thread.start()
+    
+    def stop_conflict_refresh(self):
+        """Stop the background conflict scan thread and wait for it to exit"""
+        self._conflict_stop.set()
+        self._conflict_refresh.set()
+        if self._conflict_thread is not None:
+            self._conflict_thread.join(timeout=5)
+            self._conflict_thread = None
+    
+    def _refresh_conflicts_loop(self):
+        """Recompute conflicts every CONFLICT_REFRESH_SECONDS, or sooner after an assignment change"""
+        while not self._conflict_stop.is_set():
+            try:
+                self._recompute_conflicts()
+            except Exception as e:
+                logger.error(f"Error refreshing conflicts: {e}")
+            
+            self._conflict_refresh.wait(CONFLICT_REFRESH_SECONDS)
+            self._conflict_refresh.clear()
     
     def _handle_pilot_status_update(self, user_input: str) -> str:
         """Handle pilot status update requests"""
         # Extract pilot ID and status from user input
         # This is a simplified version - in reality, you'd use NLP
         pilots = self.sheets_service.get_pilots()
+        user_input_lower = user_input.lower()
         
-        # Look for pilot names/IDs in input
-        for pilot in pilots:
-            if pilot.name.lower() in user_input.lower() or pilot.pilot_id.lower() in user_input.lower():
-                # Extract status from input
-                status_keywords = {
-                    'available': 'Available',
-                    'on leave': 'On Leave',
-                    'unavailable': 'Unavailable',
-                    'assigned': 'Assigned'
-                }
-                
-                for keyword, status in status_keywords.items():
-                    if keyword in user_input.lower():
-                        success = self.sheets_service.update_pilot_status(pilot.pilot_id, status)
-                        if success:
-                            return f"Updated {pilot.name} ({pilot.pilot_id}) status to {status}."
-                        else:
-                            return f"Failed to update {pilot.name}'s status."
+        # Look for pilot names/IDs in input; the index is rebuilt only when the pilot list changes
+        if self._pilot_index is None or self._pilot_index.items is not pilots:
+            self._pilot_index = _NameIndex(pilots, lambda p: (p.name.lower(), p.pilot_id.lower()))
+        pilot = self._pilot_index.first_match(user_input_lower)
+        
+        if pilot:
+            # Extract status from input; whole-word matching keeps "unavailable" from reading as "available"
+            status_match = _STATUS_PATTERN.search(user_input_lower)
+            
+            if status_match:
+                status = PILOT_STATUS_KEYWORDS[status_match.group(1)]
+                success = self.sheets_service.update_pilot_status(pilot.pilot_id, status)
+                if success:
+                    self._conflict_refresh.set()
+                    return f"Updated {pilot.name} ({pilot.pilot_id}) status to {status}."
+                else:
+                    return f"Failed to update {pilot.name}'s status."
         
         return "I couldn't identify which pilot's status to update. Please specify the pilot name or ID."
     
@@ -245,14 +448,36 @@ class CoordinatorAgent:
         """Handle urgent assignment requests"""
         # Extract mission ID from input
         missions = self.sheets_service.get_missions()
+        user_input_lower = user_input.lower()
         
-        for mission in missions:
-            if mission.project_id.lower() in user_input.lower() or mission.client.lower() in user_input.lower():
-                result = self.handle_urgent_reassignment(mission.project_id)
+        # Several project IDs in one request are assigned jointly so they don't compete greedily
+        # Only whole tokens that exactly equal a project ID count here, so "PRJ0010" never also names PRJ001
+        if self._mission_ids is None or self._mission_ids[0] is not missions:
+            self._mission_ids = (missions, {m.project_id.lower(): m.project_id for m in reversed(missions)})
+        ids_by_token = self._mission_ids[1]
+        named_ids = list(dict.fromkeys(
+            ids_by_token[token] for token in _ID_TOKEN_PATTERN.findall(user_input_lower) if token in ids_by_token
+        ))
+        if len(named_ids) > 1:
+            results = self.handle_urgent_reassignments(named_ids)
+            lines = []
+            for project_id, result in results.items():
                 if result["success"]:
-                    return f"Urgent assignment completed for {mission.project_id}."
+                    lines.append(f"Urgent assignment completed for {project_id}.")
                 else:
-                    return f"Failed to assign urgently: {result['error']}"
+                    lines.append(f"Failed to assign {project_id} urgently: {result['error']}")
+            return "\n".join(lines)
+        
+        if self._mission_index is None or self._mission_index.items is not missions:
+            self._mission_index = _NameIndex(missions, lambda m: (m.project_id.lower(), m.client.lower()))
+        mission = self._mission_index.first_match(user_input_lower)
+        
+        if mission:
+            result = self.handle_urgent_reassignment(mission.project_id)
+            if result["success"]:
+                return f"Urgent assignment completed for {mission.project_id}."
+            else:
+                return f"Failed to assign urgently: {result['error']}"
         
         return "I couldn't identify which mission needs urgent assignment. Please specify the project ID or client name."
     
@@ -320,30 +545,26 @@ What would you like to do?"""
         # This implements cascading reassignment logic
         options = []
         
+        # Run the matching pipeline once over every resource; each candidate is then an O(1) check
+        matching_pilot_ids = {p.pilot_id for p in self.matching_service.find_matching_pilots(urgent_mission, all_pilots)}
+        matching_drone_ids = {d.drone_id for d in self.matching_service.find_matching_drones(urgent_mission, all_drones)}
+        
         # Find lower priority missions that could be delayed
-        lower_priority_missions = [
+        lower_priority_missions = (
             m for m in all_missions 
             if m.priority in ['Standard', 'Low'] 
             and m.assigned_pilot and m.assigned_drone
-        ]
+        )
         
         for mission in lower_priority_missions:
-            # Check if resources from this mission could serve the urgent mission
-            pilot = next((p for p in all_pilots if p.pilot_id == mission.assigned_pilot), None)
-            drone = next((d for d in all_drones if d.drone_id == mission.assigned_drone), None)
-            
-            if pilot and drone:
-                # Check if they match urgent mission requirements
-                matching_pilots = self.matching_service.find_matching_pilots(urgent_mission, [pilot])
-                matching_drones = self.matching_service.find_matching_drones(urgent_mission, [drone])
-                
-                if matching_pilots and matching_drones:
-                    options.append({
-                        "mission_to_delay": mission.project_id,
-                        "pilot": pilot.pilot_id,
-                        "drone": drone.drone_id,
-                        "priority_difference": self._get_priority_difference(urgent_mission.priority, mission.priority)
-                    })
+            # Check if resources from this mission match urgent mission requirements
+            if mission.assigned_pilot in matching_pilot_ids and mission.assigned_drone in matching_drone_ids:
+                options.append({
+                    "mission_to_delay": mission.project_id,
+                    "pilot": mission.assigned_pilot,
+                    "drone": mission.assigned_drone,
+                    "priority_difference": self._get_priority_difference(urgent_mission.priority, mission.priority)
+                })
         
         if options:
             # Sort by least disruptive option
@@ -362,11 +583,4 @@ What would you like to do?"""
     
     def _get_priority_difference(self, priority1: str, priority2: str) -> int:
         """Calculate priority difference"""
-        priority_levels = {
-            "Urgent": 4,
-            "High": 3,
-            "Standard": 2,
-            "Low": 1
-        }
-        
-        return priority_levels.get(priority1, 0) - priority_levels.get(priority2, 0)
\ No newline at end of file
+        return PRIORITY_LEVELS.get(priority1, 0) - PRIORITY_LEVELS.get(priority2, 0)
\ No newline at end of file
@@ -1,5 +1,9 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Optional
 import logging
+import re
+from collections import Counter
+from functools import lru_cache
+import numpy as np
 from datetime import datetime, date
 
 from api.services.sheets_service import SheetsService
@@ -7,162 +11,204 @@ from api.models.drone import Drone
 
 logger = logging.getLogger(__name__)
 
+# Keywords recognised in inventory queries, each kind listed in priority order
+_QUERY_KEYWORDS = {
+    "intent": ["available", "maintenance", "capability", "thermal", "lidar", "location"],
+    "capability": ["thermal", "lidar", "rgb", "multispectral"],
+    "location": ["bangalore", "mumbai", "delhi", "chennai"],
+}
+
+# A keyword can serve several kinds (e.g. "thermal" both routes and names a capability)
+_KEYWORD_RANKS: Dict[str, List[Tuple[str, int]]] = {}
+for _kind, _keywords in _QUERY_KEYWORDS.items():
+    for _rank, _keyword in enumerate(_keywords):
+        _KEYWORD_RANKS.setdefault(_keyword, []).append((_kind, _rank))
+
+_KEYWORD_PATTERN = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(_KEYWORD_RANKS, key=len, reverse=True))) + "))"
+)
+
+@lru_cache(maxsize=1024)
+def _scan_query(query_lower: str) -> Dict[str, str]:
+    """Find the highest-priority keyword of each kind in one pass over a lowercased query"""
+    best = {}
+    for match in _KEYWORD_PATTERN.finditer(query_lower):
+        keyword = match.group(1)
+        for kind, rank in _KEYWORD_RANKS[keyword]:
+            if kind not in best or rank < best[kind][0]:
+                best[kind] = (rank, keyword)
+    return {kind: keyword for kind, (rank, keyword) in best.items()}
+
 class InventoryManager:
     """Agent for managing drone inventory"""
     
     def __init__(self, sheets_service: SheetsService):
         self.sheets_service = sheets_service
+        self._capability_sets: Optional[Tuple[List[Drone], List[frozenset]]] = None
+    
+    def _get_capability_sets(self, drones: List[Drone]) -> List[frozenset]:
+        """Lowercased capability set for each drone, rebuilt only when a different drone list is passed"""
+        cached = self._capability_sets
+        if cached is None or cached[0] is not drones:
+            cached = (drones, [frozenset(c.lower() for c in d.capabilities) for d in drones])
+            self._capability_sets = cached
+        return cached[1]
     
     def handle_query(self, query: str) -> str:
         """Handle inventory-related queries"""
+        query_lower = query.lower()
+        intent = _scan_query(query_lower).get("intent")
         drones = self.sheets_service.get_drones()
         
-        if "available" in query.lower():
-            return self.get_availability_report(query)
-        elif "maintenance" in query.lower():
-            return self.get_maintenance_report()
-        elif "capability" in query.lower() or "thermal" in query.lower() or "lidar" in query.lower():
-            return self.get_drones_by_capability(query)
-        elif "location" in query.lower():
-            return self.get_drones_by_location(query)
+        if intent == "available":
+            return self.get_availability_report(query_lower, drones)
+        elif intent == "maintenance":
+            return self.get_maintenance_report(drones)
+        elif intent in ("capability", "thermal", "lidar"):
+            return self.get_drones_by_capability(query_lower, drones)
+        elif intent == "location":
+            return self.get_drones_by_location(query_lower, drones)
         else:
-            return self.get_inventory_summary()
+            return self.get_inventory_summary(drones)
     
-    def get_availability_report(self, query: str = "") -> str:
+    def get_availability_report(self, query: str = "", drones: Optional[List[Drone]] = None) -> str:
         """Get drone availability report"""
-        drones = self.sheets_service.get_drones()
+        if drones is None:
+            drones = self.sheets_service.get_drones()
         
-        available_drones = [d for d in drones if d.status == "Available"]
-        in_use_drones = [d for d in drones if d.status == "In Use"]
-        maintenance_drones = [d for d in drones if d.status == "Maintenance"]
+        # Bucket drones by status in a single pass
+        buckets = {"Available": [], "In Use": [], "Maintenance": []}
+        for drone in drones:
+            bucket = buckets.get(drone.status)
+            if bucket is not None:
+                bucket.append(drone)
+        
+        available_drones = buckets["Available"]
+        in_use_drones = buckets["In Use"]
+        maintenance_drones = buckets["Maintenance"]
         
-        response = f"**Drone Availability Report**\n\n"
-        response += f"Total Drones: {len(drones)}\n"
-        response += f"Available: {len(available_drones)}\n"
-        response += f"In Use: {len(in_use_drones)}\n"
-        response += f"Maintenance: {len(maintenance_drones)}\n\n"
+        parts = ["**Drone Availability Report**\n\n"]
+        parts.append(f"Total Drones: {len(drones)}\n")
+        parts.append(f"Available: {len(available_drones)}\n")
+        parts.append(f"In Use: {len(in_use_drones)}\n")
+        parts.append(f"Maintenance: {len(maintenance_drones)}\n\n")
         
         if available_drones:
-            response += "**Available Drones:**\n"
+            parts.append("**Available Drones:**\n")
             for drone in available_drones:
-                response += f"- {drone.drone_id} ({drone.model}) - {drone.location}\n"
-                response += f"  Capabilities: {', '.join(drone.capabilities)}\n"
+                parts.append(f"- {drone.drone_id} ({drone.model}) - {drone.location}\n")
+                parts.append(f"  Capabilities: {', '.join(drone.capabilities)}\n")
         
-        return response
+        return "".join(parts)
     
-    def get_maintenance_report(self) -> str:
+    def get_maintenance_report(self, drones: Optional[List[Drone]] = None) -> str:
         """Get maintenance report"""
-        drones = self.sheets_service.get_drones()
+        if drones is None:
+            drones = self.sheets_service.get_drones()
         today = datetime.now().date()
         
-        maintenance_due = []
-        maintenance_overdue = []
+        # Compute days until maintenance for the whole fleet in one vectorized step
+        scheduled = [d for d in drones if d.maintenance_due]
+        due_dates = np.array([d.maintenance_due for d in scheduled], dtype='datetime64[D]')
+        days_until_due = (due_dates - np.datetime64(today, 'D')).astype(int)
         
-        for drone in drones:
-            if drone.maintenance_due:
-                days_until = (drone.maintenance_due - today).days
-                
-                if days_until <= 0:
-                    maintenance_overdue.append((drone, abs(days_until)))
-                elif days_until <= 7:
-                    maintenance_due.append((drone, days_until))
+        maintenance_overdue = [
+            (scheduled[i], abs(int(days_until_due[i])))
+            for i in np.flatnonzero(days_until_due <= 0)
+        ]
+        maintenance_due = [
+            (scheduled[i], int(days_until_due[i]))
+            for i in np.flatnonzero((days_until_due > 0) & (days_until_due <= 7))
+        ]
         
-        response = "**Maintenance Report**\n\n"
+        parts = ["**Maintenance Report**\n\n"]
         
         if maintenance_overdue:
-            response += "**⚠️ OVERDUE MAINTENANCE ⚠️**\n"
+            parts.append("**⚠️ OVERDUE MAINTENANCE ⚠️**\n")
             for drone, days_overdue in maintenance_overdue:
-                response += f"- {drone.drone_id} ({drone.model}) is {days_overdue} days overdue!\n"
-                response += f"  Location: {drone.location}, Status: {drone.status}\n"
-            response += "\n"
+                parts.append(f"- {drone.drone_id} ({drone.model}) is {days_overdue} days overdue!\n")
+                parts.append(f"  Location: {drone.location}, Status: {drone.status}\n")
+            parts.append("\n")
         
         if maintenance_due:
-            response += "**⚠️ UPCOMING MAINTENANCE (within 7 days)**\n"
+            parts.append("**⚠️ UPCOMING MAINTENANCE (within 7 days)**\n")
             for drone, days_until in maintenance_due:
-                response += f"- {drone.drone_id} ({drone.model}) due in {days_until} days\n"
-                response += f"  Due: {drone.maintenance_due}, Location: {drone.location}\n"
-            response += "\n"
+                parts.append(f"- {drone.drone_id} ({drone.model}) due in {days_until} days\n")
+                parts.append(f"  Due: {drone.maintenance_due}, Location: {drone.location}\n")
+            parts.append("\n")
         
         if not maintenance_overdue and not maintenance_due:
-            response += "No drones require immediate maintenance.\n"
+            parts.append("No drones require immediate maintenance.\n")
         
         # Show all maintenance schedule
-        response += "\n**All Maintenance Schedule:**\n"
-        drones_with_maintenance = [d for d in drones if d.maintenance_due]
-        drones_with_maintenance.sort(key=lambda x: x.maintenance_due)
-        
-        for drone in drones_with_maintenance:
-            days_until = (drone.maintenance_due - today).days
+        parts.append("\n**All Maintenance Schedule:**\n")
+        for i in np.argsort(days_until_due, kind='stable'):
+            drone = scheduled[i]
+            days_until = int(days_until_due[i])
             status_icon = "⚠️" if days_until <= 7 else "✅"
-            response += f"{status_icon} {drone.drone_id}: {drone.maintenance_due} ({days_until} days)\n"
+            parts.append(f"{status_icon} {drone.drone_id}: {drone.maintenance_due} ({days_until} days)\n")
         
-        return response
+        return "".join(parts)
     
-    def get_drones_by_capability(self, query: str) -> str:
-        """Get drones with specific capabilities"""
-        drones = self.sheets_service.get_drones()
-        
-        capabilities_keywords = ["thermal", "lidar", "rgb", "multispectral"]
-        target_capability = None
+    def get_drones_by_capability(self, query_lower: str, drones: Optional[List[Drone]] = None) -> str:
+        """Get drones with specific capabilities (query must already be lowercased)"""
+        if drones is None:
+            drones = self.sheets_service.get_drones()
+        today = datetime.now().date()
         
-        for capability in capabilities_keywords:
-            if capability in query.lower():
-                target_capability = capability
-                break
+        target_capability = _scan_query(query_lower).get("capability")
         
         if not target_capability:
             return "Please specify a capability to search for (e.g., 'drones with thermal capability')."
         
         matching_drones = [
-            d for d in drones 
-            if target_capability in [c.lower() for c in d.capabilities]
+            d for d, capabilities in zip(drones, self._get_capability_sets(drones))
+            if target_capability in capabilities
         ]
         
         if matching_drones:
-            response = f"**Drones with {target_capability.upper()} capability:**\n\n"
+            parts = [f"**Drones with {target_capability.upper()} capability:**\n\n"]
             for drone in matching_drones:
-                response += f"- {drone.drone_id} ({drone.model})\n"
-                response += f"  Status: {drone.status}, Location: {drone.location}\n"
-                response += f"  All Capabilities: {', '.join(drone.capabilities)}\n"
+                parts.append(f"- {drone.drone_id} ({drone.model})\n")
+                parts.append(f"  Status: {drone.status}, Location: {drone.location}\n")
+                parts.append(f"  All Capabilities: {', '.join(drone.capabilities)}\n")
                 if drone.maintenance_due:
-                    days_until = (drone.maintenance_due - datetime.now().date()).days
+                    days_until = (drone.maintenance_due - today).days
                     if days_until <= 7:
-                        response += f"  ⚠️ Maintenance due in {days_until} days\n"
-                response += "\n"
-            return response
+                        parts.append(f"  ⚠️ Maintenance due in {days_until} days\n")
+                parts.append("\n")
+            return "".join(parts)
         else:
             return f"No drones found with {target_capability} capability."
     
-    def get_drones_by_location(self, query: str) -> str:
-        """Get drones in specific location"""
-        drones = self.sheets_service.get_drones()
-        
-        locations = ["bangalore", "mumbai", "delhi", "chennai"]
-        target_location = None
+    def get_drones_by_location(self, query_lower: str, drones: Optional[List[Drone]] = None) -> str:
+        """Get drones in specific location (query must already be lowercased)"""
+        if drones is None:
+            drones = self.sheets_service.get_drones()
+        today = datetime.now().date()
         
-        for location in locations:
-            if location in query.lower():
-                target_location = location
-                break
+        target_location = _scan_query(query_lower).get("location")
         
         if not target_location:
             # Try to get location from query words
-            words = query.lower().split()
+            fleet_locations = {d.location for d in drones}
+            words = query_lower.split()
             for word in words:
-                if word.capitalize() in [d.location for d in drones]:
+                if word.capitalize() in fleet_locations:
                     target_location = word.capitalize()
                     break
         
         if not target_location:
             return "Please specify a location (e.g., 'drones in Bangalore')."
         
+        target_location_lower = target_location.lower()
         matching_drones = [
             d for d in drones 
-            if d.location.lower() == target_location.lower()
+            if d.location.lower() == target_location_lower
         ]
         
         if matching_drones:
-            response = f"**Drones in {target_location.title()}:**\n\n"
+            parts = [f"**Drones in {target_location.title()}:**\n\n"]
             
             # Group by status
             status_groups = {}
@@ -170,54 +216,48 @@ class InventoryManager:
                 status_groups.setdefault(drone.status, []).append(drone)
             
             for status, drones_list in status_groups.items():
-                response += f"**{status}:**\n"
+                parts.append(f"**{status}:**\n")
                 for drone in drones_list:
-                    response += f"- {drone.drone_id} ({drone.model})\n"
-                    response += f"  Capabilities: {', '.join(drone.capabilities)}\n"
+                    parts.append(f"- {drone.drone_id} ({drone.model})\n")
+                    parts.append(f"  Capabilities: {', '.join(drone.capabilities)}\n")
                     if drone.maintenance_due:
-                        days_until = (drone.maintenance_due - datetime.now().date()).days
-                        response += f"  Maintenance: {drone.maintenance_due} ({days_until} days)\n"
-                response += "\n"
+                        days_until = (drone.maintenance_due - today).days
+                        parts.append(f"  Maintenance: {drone.maintenance_due} ({days_until} days)\n")
+                parts.append("\n")
             
-            return response
+            return "".join(parts)
         else:
             return f"No drones found in {target_location}."
     
-    def get_inventory_summary(self) -> str:
+    def get_inventory_summary(self, drones: Optional[List[Drone]] = None) -> str:
         """Get overall inventory summary"""
-        drones = self.sheets_service.get_drones()
+        if drones is None:
+            drones = self.sheets_service.get_drones()
         
-        response = "**Drone Inventory Summary**\n\n"
+        parts = ["**Drone Inventory Summary**\n\n"]
         
-        # Group by model
+        # Count statuses per model and drones per capability in one pass
         model_groups = {}
+        capability_counts = Counter()
         for drone in drones:
-            model_groups.setdefault(drone.model, []).append(drone)
+            status_counts = model_groups.setdefault(drone.model, {})
+            status_counts[drone.status] = status_counts.get(drone.status, 0) + 1
+            capability_counts.update(set(drone.capabilities))
         
-        for model, drones_list in model_groups.items():
-            response += f"**{model} ({len(drones_list)})**\n"
-            
-            # Count by status within model
-            status_counts = {}
-            for drone in drones_list:
-                status_counts[drone.status] = status_counts.get(drone.status, 0) + 1
+        for model, status_counts in model_groups.items():
+            parts.append(f"**{model} ({sum(status_counts.values())})**\n")
             
             for status, count in status_counts.items():
-                response += f"  {status}: {count}\n"
+                parts.append(f"  {status}: {count}\n")
             
-            response += "\n"
+            parts.append("\n")
         
         # Capability summary
-        all_capabilities = set()
-        for drone in drones:
-            all_capabilities.update(drone.capabilities)
-        
-        response += "**Capabilities Available:**\n"
-        for capability in sorted(all_capabilities):
-            count = sum(1 for d in drones if capability in d.capabilities)
-            response += f"- {capability}: {count} drones\n"
+        parts.append("**Capabilities Available:**\n")
+        for capability in sorted(capability_counts):
+            parts.append(f"- {capability}: {capability_counts[capability]} drones\n")
         
-        return response
+        return "".join(parts)
     
     def update_drone_status(self, drone_id: str, status: str) -> bool:
         """Update drone status"""
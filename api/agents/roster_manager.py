@@ -1,5 +1,7 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
+import re
+from functools import lru_cache
 from datetime import datetime
 
 from api.services.sheets_service import SheetsService
@@ -7,6 +9,51 @@ from api.models.pilot import Pilot
 
 logger = logging.getLogger(__name__)
 
+# Keywords recognised in roster queries, each kind listed in priority order
+_QUERY_KEYWORDS = {
+    "intent": ["available", "skill", "location", "certification", "cert"],
+    "skill": ["mapping", "survey", "inspection", "thermal"],
+    "location": ["bangalore", "mumbai", "delhi", "chennai"],
+    "cert": ["dgca", "night ops", "bvlos"],
+}
+
+_KEYWORD_RANKS = {
+    keyword: (kind, rank)
+    for kind, keywords in _QUERY_KEYWORDS.items()
+    for rank, keyword in enumerate(keywords)
+}
+
+# Longest keywords first so the lookahead reports e.g. "certification" over "cert"
+_KEYWORD_PATTERN = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(_KEYWORD_RANKS, key=len, reverse=True))) + "))"
+)
+
+# Per-pilot report templates; each renders a pilot's whole entry in one format call
+_AVAILABLE_LINE = "- {name} ({pilot_id}) - {location} - Skills: {skills}\n"
+_SKILL_ENTRY = (
+    "- {name} ({pilot_id})\n"
+    "  Location: {location}, Status: {status}\n"
+    "  Skills: {skills}\n"
+    "  Certifications: {certifications}\n\n"
+)
+_LOCATION_LINE = "- {name} ({pilot_id}) - {status}\n"
+_CERT_ENTRY = (
+    "- {name} ({pilot_id})\n"
+    "  Status: {status}, Location: {location}\n\n"
+)
+_SUMMARY_LINE = "- {name} ({pilot_id}) - {location}\n"
+
+@lru_cache(maxsize=1024)
+def _scan_query(query_lower: str) -> Dict[str, str]:
+    """Find the highest-priority keyword of each kind in one pass over a lowercased query"""
+    best = {}
+    for match in _KEYWORD_PATTERN.finditer(query_lower):
+        keyword = match.group(1)
+        kind, rank = _KEYWORD_RANKS[keyword]
+        if kind not in best or rank < best[kind][0]:
+            best[kind] = (rank, keyword)
+    return {kind: keyword for kind, (rank, keyword) in best.items()}
+
 class RosterManager:
     """Agent for managing pilot roster"""
     
@@ -15,157 +62,129 @@ class RosterManager:
     
     def handle_query(self, query: str) -> str:
         """Handle roster-related queries"""
+        query_lower = query.lower()
+        intent = _scan_query(query_lower).get("intent")
         pilots = self.sheets_service.get_pilots()
         
-        if "available" in query.lower():
-            return self.get_availability_report(query)
-        elif "skill" in query.lower():
-            return self.get_pilots_by_skill(query)
-        elif "location" in query.lower():
-            return self.get_pilots_by_location(query)
-        elif "certification" in query.lower() or "cert" in query.lower():
-            return self.get_pilots_by_certification(query)
+        if intent == "available":
+            return self.get_availability_report(query_lower, pilots)
+        elif intent == "skill":
+            return self.get_pilots_by_skill(query_lower, pilots)
+        elif intent == "location":
+            return self.get_pilots_by_location(query_lower, pilots)
+        elif intent in ("certification", "cert"):
+            return self.get_pilots_by_certification(query_lower, pilots)
         else:
-            return self.get_roster_summary()
+            return self.get_roster_summary(pilots)
     
-    def get_availability_report(self, query: str = "") -> str:
+    def get_availability_report(self, query: str = "", pilots: Optional[List[Pilot]] = None) -> str:
         """Get pilot availability report"""
-        pilots = self.sheets_service.get_pilots()
+        index = self.sheets_service.get_pilot_index(pilots)
+        pilots = index.pilots
         
-        available_pilots = [p for p in pilots if p.status == "Available"]
-        assigned_pilots = [p for p in pilots if p.status == "Assigned"]
-        on_leave_pilots = [p for p in pilots if p.status == "On Leave"]
+        available_pilots = index.by_status.get("Available", [])
+        assigned_pilots = index.by_status.get("Assigned", [])
+        on_leave_pilots = index.by_status.get("On Leave", [])
         
-        response = f"**Pilot Availability Report**\n\n"
-        response += f"Total Pilots: {len(pilots)}\n"
-        response += f"Available: {len(available_pilots)}\n"
-        response += f"Assigned: {len(assigned_pilots)}\n"
-        response += f"On Leave: {len(on_leave_pilots)}\n\n"
+        parts = ["**Pilot Availability Report**\n\n"]
+        parts.append(f"Total Pilots: {len(pilots)}\n")
+        parts.append(f"Available: {len(available_pilots)}\n")
+        parts.append(f"Assigned: {len(assigned_pilots)}\n")
+        parts.append(f"On Leave: {len(on_leave_pilots)}\n\n")
         
         if available_pilots:
-            response += "**Available Pilots:**\n"
+            parts.append("**Available Pilots:**\n")
             for pilot in available_pilots[:5]:  # Show top 5
-                response += f"- {pilot.name} ({pilot.pilot_id}) - {pilot.location} - Skills: {', '.join(pilot.skills)}\n"
+                parts.append(_AVAILABLE_LINE.format(
+                    name=pilot.name, pilot_id=pilot.pilot_id, location=pilot.location,
+                    skills=", ".join(pilot.skills)
+                ))
         
-        return response
+        return "".join(parts)
     
-    def get_pilots_by_skill(self, query: str) -> str:
-        """Get pilots with specific skills"""
-        pilots = self.sheets_service.get_pilots()
-        
+    def get_pilots_by_skill(self, query_lower: str, pilots: Optional[List[Pilot]] = None) -> str:
+        """Get pilots with specific skills (query must already be lowercased)"""
         # Extract skill from query (simplified)
-        skills_keywords = ["mapping", "survey", "inspection", "thermal"]
-        target_skill = None
-        
-        for skill in skills_keywords:
-            if skill in query.lower():
-                target_skill = skill
-                break
+        target_skill = _scan_query(query_lower).get("skill")
         
         if not target_skill:
             return "Please specify a skill to search for (e.g., 'pilots with mapping skills')."
         
-        matching_pilots = [
-            p for p in pilots 
-            if target_skill in [s.lower() for s in p.skills]
-        ]
+        matching_pilots = self.sheets_service.get_pilot_index(pilots).by_skill.get(target_skill, [])
         
         if matching_pilots:
-            response = f"**Pilots with {target_skill.title()} skills:**\n\n"
+            parts = [f"**Pilots with {target_skill.title()} skills:**\n\n"]
             for pilot in matching_pilots:
-                response += f"- {pilot.name} ({pilot.pilot_id})\n"
-                response += f"  Location: {pilot.location}, Status: {pilot.status}\n"
-                response += f"  Skills: {', '.join(pilot.skills)}\n"
-                response += f"  Certifications: {', '.join(pilot.certifications)}\n\n"
-            return response
+                parts.append(_SKILL_ENTRY.format(
+                    name=pilot.name, pilot_id=pilot.pilot_id, location=pilot.location, status=pilot.status,
+                    skills=", ".join(pilot.skills), certifications=", ".join(pilot.certifications)
+                ))
+            return "".join(parts)
         else:
             return f"No pilots found with {target_skill} skills."
     
-    def get_pilots_by_location(self, query: str) -> str:
-        """Get pilots in specific location"""
-        pilots = self.sheets_service.get_pilots()
+    def get_pilots_by_location(self, query_lower: str, pilots: Optional[List[Pilot]] = None) -> str:
+        """Get pilots in specific location (query must already be lowercased)"""
+        pilots_by_location = self.sheets_service.get_pilot_index(pilots).by_location
         
-        locations = ["bangalore", "mumbai", "delhi", "chennai"]
-        target_location = None
-        
-        for location in locations:
-            if location in query.lower():
-                target_location = location
-                break
+        target_location = _scan_query(query_lower).get("location")
         
         if not target_location:
-            # Try to get location from query words
-            words = query.lower().split()
+            # Try to get location from query words, checked against the indexed roster locations
+            words = query_lower.split()
             for word in words:
-                if word.capitalize() in [p.location for p in pilots]:
+                if word in pilots_by_location:
                     target_location = word.capitalize()
                     break
         
         if not target_location:
             return "Please specify a location (e.g., 'pilots in Bangalore')."
         
-        matching_pilots = [
-            p for p in pilots 
-            if p.location.lower() == target_location.lower()
-        ]
+        matching_pilots = pilots_by_location.get(target_location.lower(), [])
         
         if matching_pilots:
-            response = f"**Pilots in {target_location.title()}:**\n\n"
+            parts = [f"**Pilots in {target_location.title()}:**\n\n"]
             for pilot in matching_pilots:
-                response += f"- {pilot.name} ({pilot.pilot_id}) - {pilot.status}\n"
-            return response
+                parts.append(_LOCATION_LINE.format(name=pilot.name, pilot_id=pilot.pilot_id, status=pilot.status))
+            return "".join(parts)
         else:
             return f"No pilots found in {target_location}."
     
-    def get_pilots_by_certification(self, query: str) -> str:
-        """Get pilots with specific certifications"""
-        pilots = self.sheets_service.get_pilots()
-        
-        certs_keywords = ["dgca", "night ops", "bvlos"]
-        target_cert = None
-        
-        for cert in certs_keywords:
-            if cert in query.lower():
-                target_cert = cert
-                break
+    def get_pilots_by_certification(self, query_lower: str, pilots: Optional[List[Pilot]] = None) -> str:
+        """Get pilots with specific certifications (query must already be lowercased)"""
+        target_cert = _scan_query(query_lower).get("cert")
         
         if not target_cert:
             return "Please specify a certification to search for (e.g., 'pilots with DGCA certification')."
         
-        matching_pilots = [
-            p for p in pilots 
-            if target_cert in [c.lower() for c in p.certifications]
-        ]
+        matching_pilots = self.sheets_service.get_pilot_index(pilots).by_cert.get(target_cert, [])
         
         if matching_pilots:
-            response = f"**Pilots with {target_cert.upper()} certification:**\n\n"
+            parts = [f"**Pilots with {target_cert.upper()} certification:**\n\n"]
             for pilot in matching_pilots:
-                response += f"- {pilot.name} ({pilot.pilot_id})\n"
-                response += f"  Status: {pilot.status}, Location: {pilot.location}\n\n"
-            return response
+                parts.append(_CERT_ENTRY.format(
+                    name=pilot.name, pilot_id=pilot.pilot_id, status=pilot.status, location=pilot.location
+                ))
+            return "".join(parts)
         else:
             return f"No pilots found with {target_cert.upper()} certification."
     
-    def get_roster_summary(self) -> str:
+    def get_roster_summary(self, pilots: Optional[List[Pilot]] = None) -> str:
         """Get overall roster summary"""
-        pilots = self.sheets_service.get_pilots()
-        
-        response = "**Pilot Roster Summary**\n\n"
+        # Status groups are precomputed once per fetched pilot list
+        status_groups = self.sheets_service.get_pilot_index(pilots).by_status
         
-        # Group by status
-        status_groups = {}
-        for pilot in pilots:
-            status_groups.setdefault(pilot.status, []).append(pilot)
+        parts = ["**Pilot Roster Summary**\n\n"]
         
         for status, pilots_list in status_groups.items():
-            response += f"**{status} ({len(pilots_list)})**\n"
+            parts.append(f"**{status} ({len(pilots_list)})**\n")
             for pilot in pilots_list[:3]:  # Show first 3 in each category
-                response += f"- {pilot.name} ({pilot.pilot_id}) - {pilot.location}\n"
+                parts.append(_SUMMARY_LINE.format(name=pilot.name, pilot_id=pilot.pilot_id, location=pilot.location))
             if len(pilots_list) > 3:
-                response += f"... and {len(pilots_list) - 3} more\n"
-            response += "\n"
+                parts.append(f"... and {len(pilots_list) - 3} more\n")
+            parts.append("\n")
         
-        return response
+        return "".join(parts)
     
     def update_pilot_status(self, pilot_id: str, status: str) -> bool:
         """Update pilot status"""
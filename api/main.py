@@ -1,8 +1,13 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from datetime import datetime, date
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+import asyncio
 import logging
+import time
+import numpy as np
+import orjson
 
 from api.agents.coordinator_agent import CoordinatorAgent
 from api.services.sheets_service import SheetsService
@@ -20,7 +25,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Drone Operations Coordinator API",
     description="AI agent for managing drone operations",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -32,12 +38,84 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# How often sheet data is refreshed in the background (kept below the sheets cache TTL)
+SHEETS_REFRESH_SECONDS = 60
+
+# Sheet values that mean a mission has no pilot yet
+UNASSIGNED_PLACEHOLDERS = frozenset(['', '–', 'None', 'nan'])
+
+# Clients may reuse list responses briefly, then must revalidate with their ETag
+LIST_CACHE_CONTROL = "max-age=5, must-revalidate"
+
+# How long aggregated endpoint results (/stats, /assignments, /drones/deployment) are reused
+ENDPOINT_CACHE_TTL_SECONDS = 30
+
+# Upper bound on requests working against Google Sheets at once; kept below the threadpool size
+# so excess clients queue here instead of starving every worker thread
+SHEETS_CONCURRENCY = 16
+
 # Initialize services
 sheets_service = SheetsService()
 matching_service = MatchingService()
 coordinator_agent = CoordinatorAgent(sheets_service, matching_service)
 conflict_detector = ConflictDetector(sheets_service)
 
+_sheets_slots = asyncio.Semaphore(SHEETS_CONCURRENCY)
+
+async def _sheets_slot():
+    """Hold one Sheets slot for the duration of a request"""
+    async with _sheets_slots:
+        yield
+
+def _stream_json_list(items: Iterable[dict], headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """Stream dicts as a JSON array, encoding one row at a time instead of buffering the list"""
+    def generate():
+        yield b"["
+        for i, item in enumerate(items):
+            if i:
+                yield b","
+            yield orjson.dumps(item)
+        yield b"]"
+    
+    return StreamingResponse(generate(), media_type="application/json", headers=headers)
+
+def _cache_headers() -> Dict[str, str]:
+    """ETag headers for sheet-derived responses; the tag changes when sheet data changes or the day rolls over"""
+    etag = f'W/"{sheets_service.data_version}-{date.today().toordinal()}"'
+    return {"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL}
+
+def _not_modified(request: Request, headers: Dict[str, str]) -> Optional[Response]:
+    """Return a 304 response when the client already holds the current ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and headers["ETag"] in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return None
+
+# Aggregated endpoint results keyed by endpoint: (data_version, computed_at, result); list endpoints
+# cache their encoded JSON so repeat requests skip serialization entirely
+_endpoint_cache: Dict[str, Tuple[int, float, Any]] = {}
+
+def _cached_result(key: str, compute: Callable[[], Any]) -> Any:
+    """Return a recent result for an aggregation endpoint, recomputing when stale or when sheet data changed"""
+    data_version = sheets_service.data_version
+    now = time.monotonic()
+    cached = _endpoint_cache.get(key)
+    if cached and cached[0] == data_version and now - cached[1] < ENDPOINT_CACHE_TTL_SECONDS:
+        return cached[2]
+    
+    result = compute()
+    _endpoint_cache[key] = (data_version, now, result)
+    return result
+
+async def _refresh_sheets_loop():
+    """Periodically refresh sheet data so request handlers read from memory"""
+    while True:
+        await asyncio.sleep(SHEETS_REFRESH_SECONDS)
+        try:
+            await asyncio.to_thread(sheets_service.sync_all_data)
+        except Exception as e:
+            logger.error(f"Background sheet refresh failed: {e}")
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
@@ -47,6 +125,23 @@ async def startup_event():
         logger.info("Google Sheets authentication successful")
     except Exception as e:
         logger.error(f"Google Sheets authentication failed: {e}")
+    
+    # Warm the cache now and keep it fresh in the background
+    await asyncio.to_thread(sheets_service.sync_all_data)
+    app.state.sheets_refresh_task = asyncio.create_task(_refresh_sheets_loop())
+    coordinator_agent.start_conflict_refresh()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background work on shutdown"""
+    refresh_task = getattr(app.state, "sheets_refresh_task", None)
+    if refresh_task:
+        refresh_task.cancel()
+        try:
+            await refresh_task
+        except asyncio.CancelledError:
+            pass
+    await asyncio.to_thread(coordinator_agent.stop_conflict_refresh)
 
 @app.get("/")
 async def root():
@@ -57,105 +152,75 @@ async def root():
         "status": "operational"
     }
 
-@app.get("/stats")
+def _compute_stats() -> dict:
+    """Aggregate system statistics from sheet data"""
+    missions, pilots, drones = sheets_service.get_all_data()
+    
+    # Count available pilots and drones; statuses are canonicalized at load, so compare exactly
+    available_pilots = sum(1 for p in pilots if p.status == "Available")
+    available_drones = sum(1 for d in drones if d.status == "Available")
+    
+    # Count active missions (end date is today or in future) and pending assignments
+    # (missions without assigned pilot) in one pass; SheetsService parses end dates
+    # into date objects when missions are loaded
+    today = datetime.now().date()
+    active_missions = 0
+    pending_assignments = 0
+    for m in missions:
+        if m.end_date and m.end_date >= today:
+            active_missions += 1
+        assigned_pilot = m.assigned_pilot
+        # Only non-string cells (e.g. NaN from the CSV fallback) need coercing before the lookup
+        if assigned_pilot and not isinstance(assigned_pilot, str):
+            assigned_pilot = str(assigned_pilot)
+        if not assigned_pilot or assigned_pilot.strip() in UNASSIGNED_PLACEHOLDERS:
+            pending_assignments += 1
+    
+    return {
+        "available_pilots": available_pilots,
+        "available_drones": available_drones,
+        "active_missions": active_missions,
+        "pending_assignments": pending_assignments,
+        "last_sync": datetime.now().isoformat(),
+        "available_pilots_change": 0,
+        "available_drones_change": 0,
+        "total_pilots": len(pilots),
+        "total_drones": len(drones),
+        "total_missions": len(missions),
+        "status": "healthy"
+    }
+
+@app.get("/stats", dependencies=[Depends(_sheets_slot)])
 async def get_stats():
     """Get system statistics"""
     try:
-        sheets_service = SheetsService()
-        sheets_service.authenticate()
-        
-        pilots = sheets_service.get_pilots()
-        drones = sheets_service.get_drones()
-        missions = sheets_service.get_missions()
-        
-        # Count available pilots
-        available_pilots = 0
-        for p in pilots:
-            if p.status and p.status.lower() == "available":
-                available_pilots += 1
-        
-        # Count available drones
-        available_drones = 0
-        for d in drones:
-            if d.status and d.status.lower() == "available":
-                available_drones += 1
-        
-        # Count active missions (end date is today or in future)
-        today = datetime.now().date()
-        active_missions = 0
-        for m in missions:
-            try:
-                # m.end_date could be a date object OR a string
-                end_date = None
-                
-                if isinstance(m.end_date, date):
-                    # Already a date object
-                    end_date = m.end_date
-                elif isinstance(m.end_date, str):
-                    # Try to parse string date
-                    try:
-                        end_date = datetime.strptime(m.end_date, '%Y-%m-%d').date()
-                    except ValueError:
-                        # Try other formats
-                        for fmt in ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y']:
-                            try:
-                                end_date = datetime.strptime(m.end_date, fmt).date()
-                                break
-                            except ValueError:
-                                continue
-                elif m.end_date is None:
-                    # No end date, skip
-                    continue
-                
-                if end_date and end_date >= today:
-                    active_missions += 1
-            except Exception as e:
-                logger.warning(f"Error processing mission date for {m.project_id}: {e}")
-                continue
-        
-        # Count pending assignments (missions without assigned pilot)
-        pending_assignments = 0
-        for m in missions:
-            if not m.assigned_pilot or str(m.assigned_pilot).strip() in ['', '–', 'None', 'nan']:
-                pending_assignments += 1
-        
-        return {
-            "available_pilots": available_pilots,
-            "available_drones": available_drones,
-            "active_missions": active_missions,
-            "pending_assignments": pending_assignments,
-            "last_sync": datetime.now().isoformat(),
-            "available_pilots_change": 0,
-            "available_drones_change": 0,
-            "total_pilots": len(pilots),
-            "total_drones": len(drones),
-            "total_missions": len(missions),
-            "status": "healthy"
-        }
+        return await asyncio.to_thread(_cached_result, "stats", _compute_stats)
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+        # Traceback is only formatted when debug logging is enabled
+        logger.debug("Stats failure details", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/pilots")
-async def get_pilots(status: str = None, location: str = None):
+@app.get("/pilots", dependencies=[Depends(_sheets_slot)])
+def get_pilots(request: Request, status: str = None, location: str = None):
     """Get all pilots with optional filters"""
     try:
-        pilots = sheets_service.get_pilots()
-        
-        # Apply filters
-        if status:
-            pilots = [p for p in pilots if p.status == status]
-        if location:
-            pilots = [p for p in pilots if p.location == location]
-        
-        return [p.dict() for p in pilots]
+        # Tag before reading so a refetch mid-request can only make the tag older, never newer
+        headers = _cache_headers()
+        not_modified = _not_modified(request, headers)
+        if not_modified:
+            return not_modified
+        
+        # Filters are answered from pre-serialized pilots grouped by field, so only matches are touched
+        return _stream_json_list(
+            sheets_service.filter_dicts("pilots", status=status, location=location), headers=headers
+        )
     except Exception as e:
         logger.error(f"Error getting pilots: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/pilots/{pilot_id}")
-async def get_pilot(pilot_id: str):
+@app.get("/pilots/{pilot_id}", dependencies=[Depends(_sheets_slot)])
+def get_pilot(pilot_id: str):
     """Get specific pilot"""
     try:
         pilot = sheets_service.get_pilot(pilot_id)
@@ -168,8 +233,8 @@ async def get_pilot(pilot_id: str):
         logger.error(f"Error getting pilot {pilot_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.put("/pilots/{pilot_id}/status")
-async def update_pilot_status(pilot_id: str, update: PilotUpdate):
+@app.put("/pilots/{pilot_id}/status", dependencies=[Depends(_sheets_slot)])
+def update_pilot_status(pilot_id: str, update: PilotUpdate):
     """Update pilot status"""
     try:
         success = sheets_service.update_pilot_status(pilot_id, update.status)
@@ -189,74 +254,82 @@ async def update_pilot_status(pilot_id: str, update: PilotUpdate):
         logger.error(f"Error updating pilot {pilot_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/drones")
-async def get_drones(status: str = None, location: str = None):
+@app.get("/drones", dependencies=[Depends(_sheets_slot)])
+def get_drones(request: Request, status: str = None, location: str = None):
     """Get all drones with optional filters"""
     try:
-        drones = sheets_service.get_drones()
-        
-        # Apply filters
-        if status:
-            drones = [d for d in drones if d.status == status]
-        if location:
-            drones = [d for d in drones if d.location == location]
-        
-        return [d.dict() for d in drones]
+        # Tag before reading so a refetch mid-request can only make the tag older, never newer
+        headers = _cache_headers()
+        not_modified = _not_modified(request, headers)
+        if not_modified:
+            return not_modified
+        
+        # Filters are answered from pre-serialized drones grouped by field, so only matches are touched
+        return _stream_json_list(
+            sheets_service.filter_dicts("drones", status=status, location=location), headers=headers
+        )
     except Exception as e:
         logger.error(f"Error getting drones: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/missions")
-async def get_missions(priority: str = None, location: str = None):
+@app.get("/missions", dependencies=[Depends(_sheets_slot)])
+def get_missions(request: Request, priority: str = None, location: str = None):
     """Get all missions with optional filters"""
     try:
-        missions = sheets_service.get_missions()
-        
-        # Apply filters
-        if priority:
-            missions = [m for m in missions if m.priority == priority]
-        if location:
-            missions = [m for m in missions if m.location == location]
-        
-        return [m.dict() for m in missions]
+        # Tag before reading so a refetch mid-request can only make the tag older, never newer
+        headers = _cache_headers()
+        not_modified = _not_modified(request, headers)
+        if not_modified:
+            return not_modified
+        
+        # Filters are answered from pre-serialized missions grouped by field, so only matches are touched
+        return _stream_json_list(
+            sheets_service.filter_dicts("missions", priority=priority, location=location), headers=headers
+        )
     except Exception as e:
         logger.error(f"Error getting missions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/missions/{project_id}/available-pilots")
-async def get_available_pilots_for_mission(project_id: str):
+@app.get("/missions/{project_id}/available-pilots", dependencies=[Depends(_sheets_slot)])
+def get_available_pilots_for_mission(project_id: str):
     """Get available pilots for a specific mission"""
     try:
         mission = sheets_service.get_mission(project_id)
         if not mission:
             raise HTTPException(status_code=404, detail="Mission not found")
         
-        available_pilots = matching_service.find_matching_pilots(mission)
-        return [p.dict() for p in available_pilots]
+        # Match against the loaded pilots and answer with their pre-serialized dicts
+        pilots, pilot_dicts = sheets_service.get_records_with_dicts("pilots")
+        dict_for = {id(p): d for p, d in zip(pilots, pilot_dicts)}
+        available_pilots = matching_service.find_matching_pilots(mission, pilots)
+        return [dict_for[id(p)] for p in available_pilots]
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error getting available pilots for {project_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/missions/{project_id}/available-drones")
-async def get_available_drones_for_mission(project_id: str):
+@app.get("/missions/{project_id}/available-drones", dependencies=[Depends(_sheets_slot)])
+def get_available_drones_for_mission(project_id: str):
     """Get available drones for a specific mission"""
     try:
         mission = sheets_service.get_mission(project_id)
         if not mission:
             raise HTTPException(status_code=404, detail="Mission not found")
         
-        available_drones = matching_service.find_matching_drones(mission)
-        return [d.dict() for d in available_drones]
+        # Match against the loaded drones and answer with their pre-serialized dicts
+        drones, drone_dicts = sheets_service.get_records_with_dicts("drones")
+        dict_for = {id(d): dd for d, dd in zip(drones, drone_dicts)}
+        available_drones = matching_service.find_matching_drones(mission, drones)
+        return [dict_for[id(d)] for d in available_drones]
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error getting available drones for {project_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/assign")
-async def assign_resources(project_id: str, pilot_id: str, drone_id: str):
+@app.post("/assign", dependencies=[Depends(_sheets_slot)])
+def assign_resources(project_id: str, pilot_id: str, drone_id: str):
     """Assign pilot and drone to mission"""
     try:
         result = coordinator_agent.assign_mission(project_id, pilot_id, drone_id)
@@ -272,18 +345,18 @@ async def assign_resources(project_id: str, pilot_id: str, drone_id: str):
         logger.error(f"Error assigning resources: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/conflicts")
-async def get_conflicts():
+@app.get("/conflicts", dependencies=[Depends(_sheets_slot)])
+def get_conflicts():
     """Get all detected conflicts"""
     try:
-        conflicts = conflict_detector.detect_all_conflicts()
-        return conflicts
+        # Served from the coordinator's scan, which reruns whenever sheet data changes
+        return coordinator_agent.get_cached_conflicts()
     except Exception as e:
         logger.error(f"Error getting conflicts: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/chat")
-async def chat_with_agent(message: dict):
+@app.post("/chat", dependencies=[Depends(_sheets_slot)])
+def chat_with_agent(message: dict):
     """Chat with the coordinator agent"""
     try:
         user_message = message.get("message", "")
@@ -320,57 +393,63 @@ async def get_recent_activity():
     ]
 
 # Assignment Tracking Endpoints
-@app.get("/assignments")
-async def get_all_assignments():
+def _compute_assignments() -> list:
+    """Build the list of current mission assignments"""
+    missions, pilots, drones = sheets_service.get_all_data()
+    pilots_by_id = {p.pilot_id: p for p in reversed(pilots)}
+    drones_by_id = {d.drone_id: d for d in reversed(drones)}
+    today = datetime.now().date()
+    
+    assignments = []
+    for mission in missions:
+        if mission.assigned_pilot and mission.assigned_drone:
+            pilot = pilots_by_id.get(mission.assigned_pilot)
+            drone = drones_by_id.get(mission.assigned_drone)
+            
+            assignment = {
+                "project_id": mission.project_id,
+                "client": mission.client,
+                "location": mission.location,
+                "start_date": mission.start_date,
+                "end_date": mission.end_date,
+                "priority": mission.priority,
+                "assigned_pilot": {
+                    "pilot_id": pilot.pilot_id if pilot else mission.assigned_pilot,
+                    "name": pilot.name if pilot else "Unknown",
+                    "skills": pilot.skills if pilot else [],
+                    "location": pilot.location if pilot else "Unknown"
+                } if pilot else {"pilot_id": mission.assigned_pilot},
+                "assigned_drone": {
+                    "drone_id": drone.drone_id if drone else mission.assigned_drone,
+                    "model": drone.model if drone else "Unknown",
+                    "capabilities": drone.capabilities if drone else [],
+                    "location": drone.location if drone else "Unknown"
+                } if drone else {"drone_id": mission.assigned_drone},
+                "status": "Active" if mission.end_date and mission.end_date >= today else "Completed"
+            }
+            assignments.append(assignment)
+    
+    return assignments
+
+@app.get("/assignments", dependencies=[Depends(_sheets_slot)])
+async def get_all_assignments(request: Request):
     """Get all current assignments"""
     try:
-        sheets_service = SheetsService()
-        sheets_service.authenticate()
-        
-        missions = sheets_service.get_missions()
-        pilots = sheets_service.get_pilots()
-        drones = sheets_service.get_drones()
+        headers = _cache_headers()
+        not_modified = _not_modified(request, headers)
+        if not_modified:
+            return not_modified
         
-        assignments = []
-        for mission in missions:
-            if mission.assigned_pilot and mission.assigned_drone:
-                pilot = next((p for p in pilots if p.pilot_id == mission.assigned_pilot), None)
-                drone = next((d for d in drones if d.drone_id == mission.assigned_drone), None)
-                
-                assignment = {
-                    "project_id": mission.project_id,
-                    "client": mission.client,
-                    "location": mission.location,
-                    "start_date": mission.start_date,
-                    "end_date": mission.end_date,
-                    "priority": mission.priority,
-                    "assigned_pilot": {
-                        "pilot_id": pilot.pilot_id if pilot else mission.assigned_pilot,
-                        "name": pilot.name if pilot else "Unknown",
-                        "skills": pilot.skills if pilot else [],
-                        "location": pilot.location if pilot else "Unknown"
-                    } if pilot else {"pilot_id": mission.assigned_pilot},
-                    "assigned_drone": {
-                        "drone_id": drone.drone_id if drone else mission.assigned_drone,
-                        "model": drone.model if drone else "Unknown",
-                        "capabilities": drone.capabilities if drone else [],
-                        "location": drone.location if drone else "Unknown"
-                    } if drone else {"drone_id": mission.assigned_drone},
-                    "status": "Active" if isinstance(mission.end_date, date) and mission.end_date >= datetime.now().date() else "Completed"
-                }
-                assignments.append(assignment)
-        
-        return assignments
+        content = await asyncio.to_thread(_cached_result, "assignments", lambda: orjson.dumps(_compute_assignments()))
+        return Response(content=content, media_type="application/json", headers=headers)
     except Exception as e:
         logger.error(f"Error getting assignments: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.put("/assignments/{project_id}/reassign")
-async def reassign_mission(project_id: str, reassignment: dict):
+@app.put("/assignments/{project_id}/reassign", dependencies=[Depends(_sheets_slot)])
+def reassign_mission(project_id: str, reassignment: dict):
     """Reassign resources to a mission"""
     try:
-        sheets_service = SheetsService()
-        
         # Get current assignment
         mission = sheets_service.get_mission(project_id)
         if not mission:
@@ -387,7 +466,6 @@ async def reassign_mission(project_id: str, reassignment: dict):
             raise HTTPException(status_code=400, detail="Both pilot_id and drone_id are required")
         
         # Check if new resources are available
-        matching_service = MatchingService()
         pilots = sheets_service.get_pilots()
         drones = sheets_service.get_drones()
         
@@ -400,7 +478,6 @@ async def reassign_mission(project_id: str, reassignment: dict):
             raise HTTPException(status_code=404, detail=f"Drone {new_drone_id} not found")
         
         # Check conflicts
-        conflict_detector = ConflictDetector(sheets_service)
         conflicts = conflict_detector.check_assignment_conflicts(mission, new_pilot, new_drone)
         
         if conflicts:
@@ -412,16 +489,18 @@ async def reassign_mission(project_id: str, reassignment: dict):
         
         if success:
             # Free up old resources if they're still assigned to this mission
-            if old_pilot_id:
-                sheets_service.update_pilot_status(old_pilot_id, "Available")
-            if old_drone_id:
-                sheets_service.update_drone_status(old_drone_id, "Available")
+            unfreed = []
+            if old_pilot_id or old_drone_id:
+                unfreed = sheets_service.free_resources(old_pilot_id, old_drone_id)
             
-            return {
+            response = {
                 "message": f"Successfully reassigned {project_id}",
                 "old_assignment": {"pilot_id": old_pilot_id, "drone_id": old_drone_id},
                 "new_assignment": {"pilot_id": new_pilot_id, "drone_id": new_drone_id}
             }
+            if unfreed:
+                response["warning"] = f"Could not mark {', '.join(unfreed)} Available"
+            return response
         else:
             raise HTTPException(status_code=500, detail="Failed to update assignment in sheets")
             
@@ -432,8 +511,8 @@ async def reassign_mission(project_id: str, reassignment: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 # Drone Inventory Endpoints
-@app.get("/drones/search")
-async def search_drones(
+@app.get("/drones/search", dependencies=[Depends(_sheets_slot)])
+def search_drones(
     capability: str = None,
     location: str = None,
     status: str = None,
@@ -441,58 +520,49 @@ async def search_drones(
 ):
     """Search drones with filters"""
     try:
-        sheets_service = SheetsService()
-        sheets_service.authenticate()
-        
-        drones = sheets_service.get_drones()
-        
-        # Apply filters
-        filtered_drones = drones
-        
-        if capability:
-            filtered_drones = [d for d in filtered_drones if capability.lower() in [c.lower() for c in d.capabilities]]
-        
-        if location:
-            filtered_drones = [d for d in filtered_drones if d.location.lower() == location.lower()]
+        # Filter the pre-serialized drones against their precomputed lowercased fields,
+        # lowercasing each query value once; rows are already ordered by maintenance due date
+        rows = sheets_service.get_drone_search_rows()
         
-        if status:
-            filtered_drones = [d for d in filtered_drones if d.status.lower() == status.lower()]
+        capability_lower = capability.lower() if capability else None
+        location_lower = location.lower() if location else None
+        status_lower = status.lower() if status else None
         
-        if available_only:
-            filtered_drones = [d for d in filtered_drones if d.status == "Available"]
+        filtered_drones = [
+            d for d, capabilities_lower, drone_location, drone_status in rows
+            if (not capability_lower or capability_lower in capabilities_lower)
+            and (not location_lower or drone_location == location_lower)
+            and (not status_lower or drone_status == status_lower)
+            and (not available_only or d["status"] == "Available")
+        ]
         
-        # Sort by maintenance due date
-        filtered_drones.sort(key=lambda x: x.maintenance_due if x.maintenance_due else date(9999, 12, 31))
-        
-        return [d.dict() for d in filtered_drones]
+        return filtered_drones
         
     except Exception as e:
         logger.error(f"Error searching drones: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/drones/maintenance")
-async def get_maintenance_drones(days_threshold: int = 7):
+@app.get("/drones/maintenance", dependencies=[Depends(_sheets_slot)])
+def get_maintenance_drones(days_threshold: int = 7):
     """Get drones needing maintenance"""
     try:
-        sheets_service = SheetsService()
-        sheets_service.authenticate()
-        
-        drones = sheets_service.get_drones()
         today = datetime.now().date()
         
+        # Compute days until maintenance for every scheduled drone in one vectorized step,
+        # then keep those within the threshold ordered by urgency
+        scheduled, due_dates = sheets_service.get_drone_maintenance_schedule()
+        days_until_due = (due_dates - np.datetime64(today, 'D')).astype(int)
+        due_soon = np.flatnonzero(days_until_due <= days_threshold)
+        due_soon = due_soon[np.argsort(days_until_due[due_soon], kind='stable')]
+        
         maintenance_drones = []
-        for drone in drones:
-            if drone.maintenance_due:
-                days_until = (drone.maintenance_due - today).days
-                if days_until <= days_threshold:
-                    maintenance_drones.append({
-                        **drone.dict(),
-                        "days_until_maintenance": days_until,
-                        "status": "OVERDUE" if days_until < 0 else f"Due in {days_until} days"
-                    })
-        
-        # Sort by urgency
-        maintenance_drones.sort(key=lambda x: x["days_until_maintenance"])
+        for i in due_soon:
+            days_until = int(days_until_due[i])
+            maintenance_drones.append({
+                **scheduled[i],
+                "days_until_maintenance": days_until,
+                "status": "OVERDUE" if days_until < 0 else f"Due in {days_until} days"
+            })
         
         return maintenance_drones
         
@@ -500,12 +570,10 @@ async def get_maintenance_drones(days_threshold: int = 7):
         logger.error(f"Error getting maintenance drones: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.put("/drones/{drone_id}/status")
-async def update_drone_status(drone_id: str, update: DroneUpdate):
+@app.put("/drones/{drone_id}/status", dependencies=[Depends(_sheets_slot)])
+def update_drone_status(drone_id: str, update: DroneUpdate):
     """Update drone status"""
     try:
-        sheets_service = SheetsService()
-        
         success = sheets_service.update_drone_status(drone_id, update.status)
         if not success:
             raise HTTPException(status_code=404, detail="Drone not found")
@@ -526,12 +594,10 @@ async def update_drone_status(drone_id: str, update: DroneUpdate):
         logger.error(f"Error updating drone status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.put("/drones/{drone_id}/maintenance")
-async def update_drone_maintenance(drone_id: str, maintenance_date: dict):
+@app.put("/drones/{drone_id}/maintenance", dependencies=[Depends(_sheets_slot)])
+def update_drone_maintenance(drone_id: str, maintenance_date: dict):
     """Update drone maintenance date"""
     try:
-        sheets_service = SheetsService()
-        
         new_date_str = maintenance_date.get("maintenance_due")
         if not new_date_str:
             raise HTTPException(status_code=400, detail="maintenance_due date required")
@@ -543,20 +609,9 @@ async def update_drone_maintenance(drone_id: str, maintenance_date: dict):
             raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
         
         # Update in Google Sheets
-        worksheet = sheets_service._get_worksheet("drone_fleet")
-        if not worksheet:
-            raise HTTPException(status_code=500, detail="Cannot access drone fleet worksheet")
-        
-        cell = worksheet.find(drone_id)
-        if not cell:
+        if not sheets_service.update_drone_maintenance(drone_id, new_date_str):
             raise HTTPException(status_code=404, detail="Drone not found")
         
-        # Update maintenance due date (assuming column G)
-        worksheet.update_cell(cell.row, 7, new_date_str)
-        
-        # Clear cache
-        sheets_service._drones_cache = None
-        
         return {
             "message": f"Drone {drone_id} maintenance updated to {new_date_str}",
             "drone_id": drone_id,
@@ -569,45 +624,33 @@ async def update_drone_maintenance(drone_id: str, maintenance_date: dict):
         logger.error(f"Error updating drone maintenance: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/drones/deployment")
-async def get_deployment_status():
+def _compute_deployment_status() -> list:
+    """Build the deployment status of every drone"""
+    # The drone/mission join is maintained by SheetsService; only the date-relative urgency is added here
+    today = datetime.now().date()
+    
+    deployment_status = []
+    for status in sheets_service.get_deployment_view():
+        # Calculate maintenance urgency
+        if status["maintenance_due"]:
+            days_until = (status["maintenance_due"] - today).days
+            status = {**status, "maintenance_urgency": "OVERDUE" if days_until < 0 else f"{days_until} days"}
+        
+        deployment_status.append(status)
+    
+    return deployment_status
+
+@app.get("/drones/deployment", dependencies=[Depends(_sheets_slot)])
+async def get_deployment_status(request: Request):
     """Get deployment status of all drones"""
     try:
-        sheets_service = SheetsService()
-        sheets_service.authenticate()
-        
-        drones = sheets_service.get_drones()
-        missions = sheets_service.get_missions()
-        
-        deployment_status = []
-        for drone in drones:
-            # Find mission assigned to this drone
-            assigned_mission = next(
-                (m for m in missions if m.assigned_drone == drone.drone_id),
-                None
-            )
-            
-            status = {
-                "drone_id": drone.drone_id,
-                "model": drone.model,
-                "status": drone.status,
-                "location": drone.location,
-                "assigned_to": assigned_mission.project_id if assigned_mission else None,
-                "client": assigned_mission.client if assigned_mission else None,
-                "mission_dates": f"{assigned_mission.start_date} to {assigned_mission.end_date}" if assigned_mission else None,
-                "maintenance_due": drone.maintenance_due,
-                "capabilities": drone.capabilities
-            }
-            
-            # Calculate maintenance urgency
-            if drone.maintenance_due:
-                today = datetime.now().date()
-                days_until = (drone.maintenance_due - today).days
-                status["maintenance_urgency"] = "OVERDUE" if days_until < 0 else f"{days_until} days"
-            
-            deployment_status.append(status)
+        headers = _cache_headers()
+        not_modified = _not_modified(request, headers)
+        if not_modified:
+            return not_modified
         
-        return deployment_status
+        content = await asyncio.to_thread(_cached_result, "deployment", lambda: orjson.dumps(_compute_deployment_status()))
+        return Response(content=content, media_type="application/json", headers=headers)
         
     except Exception as e:
         logger.error(f"Error getting deployment status: {e}")
@@ -1,6 +1,9 @@
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Dict
 from datetime import datetime, date
+import heapq
 import logging
+import numpy as np
+from scipy.optimize import linear_sum_assignment
 
 from api.models.pilot import Pilot
 from api.models.drone import Drone
@@ -8,18 +11,84 @@ from api.models.mission import Mission
 
 logger = logging.getLogger(__name__)
 
+def _solve_joint_assignment(pilot_scores: List[Dict[int, float]], drone_options: List[set],
+                            n_pilots: int, n_drones: int) -> Dict[int, Tuple[int, int]]:
+    """Give as many missions as possible both a pilot and a drone, maximizing total pilot score among those
+    
+    Posed as one square assignment over rows [pilots | mission drone sides | spare rows] and columns
+    [mission pilot sides | drones | spare columns]. A mission is filled when a pilot takes its pilot side,
+    which forces its drone side onto a compatible drone; otherwise its two sides pair with each other.
+    Each filled mission earns a bonus larger than any total score, so fill count outranks score.
+    """
+    n_missions = len(pilot_scores)
+    mission_rows = n_pilots
+    spare_rows = n_pilots + n_missions
+    drone_cols = n_missions
+    spare_cols = n_missions + n_drones
+    size = n_pilots + n_missions + n_drones
+    
+    fill_bonus = 1.0 + sum(max(scores.values(), default=0.0) for scores in pilot_scores)
+    cost = np.full((size, size), np.inf)
+    for i in range(n_missions):
+        for j, score in pilot_scores[i].items():
+            cost[j, i] = -(fill_bonus + score)
+        cost[mission_rows + i, i] = 0.0
+        for k in drone_options[i]:
+            cost[mission_rows + i, drone_cols + k] = 0.0
+    # Unused pilots take spare columns; spare rows take unused drones and the leftover spare columns
+    cost[:n_pilots, spare_cols:] = 0.0
+    cost[spare_rows:, drone_cols:] = 0.0
+    
+    rows, cols = linear_sum_assignment(cost)
+    
+    pilot_for = {}
+    drone_for = {}
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        if row < n_pilots and col < n_missions:
+            pilot_for[col] = row
+        elif mission_rows <= row < spare_rows and drone_cols <= col < spare_cols:
+            drone_for[row - mission_rows] = col - drone_cols
+    return {i: (pilot_for[i], drone_for[i]) for i in pilot_for}
+
 class MatchingService:
     """Service for matching pilots and drones to missions"""
     
-    def find_matching_pilots(self, mission: Mission, pilots: List[Pilot] = None) -> List[Pilot]:
-        """Find pilots that match mission requirements"""
+    def __init__(self):
+        self._pilot_sets: Optional[Tuple[List[Pilot], List[Tuple[frozenset, frozenset]]]] = None
+    
+    def _get_pilot_sets(self, pilots: List[Pilot]) -> List[Tuple[frozenset, frozenset]]:
+        """Skill and certification sets for each pilot, rebuilt only when a different pilot list is passed"""
+        cached = self._pilot_sets
+        if cached is None or cached[0] is not pilots:
+            cached = (pilots, [(frozenset(p.skills), frozenset(p.certifications)) for p in pilots])
+            self._pilot_sets = cached
+        return cached[1]
+    
+    def find_matching_pilots(self, mission: Mission, pilots: List[Pilot] = None,
+                             top_k: Optional[int] = None) -> List[Pilot]:
+        """Find pilots that match mission requirements, optionally only the top_k best"""
         if pilots is None:
             # This should be injected by the calling service
             return []
         
+        matching_pilots = self._score_matching_pilots(mission, pilots)
+        
+        # Sort by match score (highest first); only rank the top_k when that is all the caller needs
+        if top_k is not None:
+            matching_pilots = heapq.nlargest(top_k, matching_pilots, key=lambda x: x[1])
+        else:
+            matching_pilots.sort(key=lambda x: x[1], reverse=True)
+        return [pilot for pilot, _ in matching_pilots]
+    
+    def _score_matching_pilots(self, mission: Mission, pilots: List[Pilot]) -> List[Tuple[Pilot, float]]:
+        """Pair each pilot that meets the mission requirements with its match score"""
         matching_pilots = []
         
-        for pilot in pilots:
+        # Mission requirements are the same for every pilot, so build their sets once
+        mission_skills = frozenset(mission.required_skills)
+        mission_certs = frozenset(mission.required_certs)
+        
+        for pilot, (pilot_skills, pilot_certs) in zip(pilots, self._get_pilot_sets(pilots)):
             # Check basic availability
             if pilot.status != "Available":
                 continue
@@ -34,24 +103,20 @@ class MatchingService:
                     continue
             
             # Check skills
-            mission_skills = set(mission.required_skills)
-            pilot_skills = set(pilot.skills)
             if not mission_skills.issubset(pilot_skills):
                 continue
             
             # Check certifications
-            mission_certs = set(mission.required_certs)
-            pilot_certs = set(pilot.certifications)
             if not mission_certs.issubset(pilot_certs):
                 continue
             
             # Calculate match score
-            match_score = self._calculate_pilot_match_score(pilot, mission)
+            match_score = self._calculate_pilot_match_score(
+                pilot, mission, mission_skills, mission_certs, pilot_skills, pilot_certs
+            )
             matching_pilots.append((pilot, match_score))
         
-        # Sort by match score (highest first)
-        matching_pilots.sort(key=lambda x: x[1], reverse=True)
-        return [pilot for pilot, _ in matching_pilots]
+        return matching_pilots
     
     def find_matching_drones(self, mission: Mission, drones: List[Drone] = None) -> List[Drone]:
         """Find drones that match mission requirements"""
@@ -85,7 +150,7 @@ class MatchingService:
                            pilots: List[Pilot], 
                            drones: List[Drone]) -> Tuple[Optional[Pilot], Optional[Drone]]:
         """Find the best pilot-drone combination for a mission"""
-        matching_pilots = self.find_matching_pilots(mission, pilots)
+        matching_pilots = self.find_matching_pilots(mission, pilots, top_k=1)
         matching_drones = self.find_matching_drones(mission, drones)
         
         if not matching_pilots or not matching_drones:
@@ -98,20 +163,50 @@ class MatchingService:
         
         return best_pilot, best_drone
     
-    def _calculate_pilot_match_score(self, pilot: Pilot, mission: Mission) -> float:
-        """Calculate match score between pilot and mission"""
+    def assign_missions_batch(self, missions: List[Mission],
+                              pilots: List[Pilot],
+                              drones: List[Drone]) -> Dict[str, Tuple[Optional[Pilot], Optional[Drone]]]:
+        """Jointly assign pilots and drones to several missions: fill as many as possible, then maximize pilot match score"""
+        if len(missions) <= 1:
+            # Nothing to share between missions, so the greedy pick is already optimal
+            return {m.project_id: self.find_best_assignment(m, pilots, drones) for m in missions}
+        
+        pilot_index = {id(p): j for j, p in enumerate(pilots)}
+        drone_index = {id(d): j for j, d in enumerate(drones)}
+        
+        # Feasible cells per mission: pilot column -> match score, and the set of drone columns
+        pilot_scores = [
+            {pilot_index[id(pilot)]: score for pilot, score in self._score_matching_pilots(mission, pilots)}
+            for mission in missions
+        ]
+        drone_options = [
+            {drone_index[id(drone)] for drone in self.find_matching_drones(mission, drones)}
+            for mission in missions
+        ]
+        
+        chosen = _solve_joint_assignment(pilot_scores, drone_options, len(pilots), len(drones))
+        
+        assignments = {}
+        for i, mission in enumerate(missions):
+            if i in chosen:
+                j, k = chosen[i]
+                assignments[mission.project_id] = (pilots[j], drones[k])
+            else:
+                assignments[mission.project_id] = (None, None)
+        return assignments
+    
+    def _calculate_pilot_match_score(self, pilot: Pilot, mission: Mission,
+                                     mission_skills: frozenset, mission_certs: frozenset,
+                                     pilot_skills: frozenset, pilot_certs: frozenset) -> float:
+        """Calculate match score between pilot and mission, given the requirement and pilot sets"""
         score = 0.0
         
         # Skills match (40%)
-        mission_skills = set(mission.required_skills)
-        pilot_skills = set(pilot.skills)
         skill_overlap = len(mission_skills.intersection(pilot_skills))
         skill_score = (skill_overlap / len(mission_skills)) * 0.4
         score += skill_score
         
         # Certifications match (30%)
-        mission_certs = set(mission.required_certs)
-        pilot_certs = set(pilot.certifications)
         cert_overlap = len(mission_certs.intersection(pilot_certs))
         cert_score = (cert_overlap / len(mission_certs)) * 0.3 if mission_certs else 0.3
         score += cert_score
@@ -1,9 +1,13 @@
 import gspread
 from google.oauth2.service_account import Credentials
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import pandas as pd
-from datetime import datetime
+import numpy as np
+from datetime import datetime, date
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import os
+import sys
 import logging
 
 from api.models.pilot import Pilot
@@ -12,6 +16,79 @@ from api.models.mission import Mission
 
 logger = logging.getLogger(__name__)
 
+# How long fetched sheet data is served from memory before refetching
+CACHE_TTL_SECONDS = 300
+
+# Date formats accepted in sheet cells, most common first
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y')
+
+@lru_cache(maxsize=4096)
+def _parse_date_string(date_str: str) -> Optional[date]:
+    """Parse a stripped date string with the first matching format; sheets repeat dates heavily, so results are memoized"""
+    # Zero-padded ISO dates are the common case and fromisoformat parses them far faster than strptime
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        try:
+            return date.fromisoformat(date_str)
+        except ValueError:
+            pass
+    
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+# Sort key stand-in for drones without a maintenance date, so they sort last
+_FAR_FUTURE = date(9999, 12, 31)
+
+# Canonical spelling of known statuses, keyed by their stripped lowercase form
+STATUS_CANONICAL = {
+    "available": "Available",
+    "assigned": "Assigned",
+    "on leave": "On Leave",
+    "unavailable": "Unavailable",
+    "in use": "In Use",
+    "maintenance": "Maintenance"
+}
+
+@lru_cache(maxsize=64)
+def _normalize_status(value):
+    """Map a status cell to its canonical interned spelling so filters can compare exactly"""
+    if not isinstance(value, str):
+        return value
+    value = value.strip()
+    return sys.intern(STATUS_CANONICAL.get(value.lower(), value))
+
+def _intern(value):
+    """Intern repeated categorical strings (status, location) so equality checks hit the identity fast path"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+class PilotIndex:
+    """Lookup tables over one pilot list, keyed by status and lowercased location, skill and certification"""
+    
+    def __init__(self, pilots: List[Pilot]):
+        self.pilots = pilots
+        self.by_status: Dict[str, List[Pilot]] = {}
+        self.by_location: Dict[str, List[Pilot]] = {}
+        self.by_skill: Dict[str, List[Pilot]] = {}
+        self.by_cert: Dict[str, List[Pilot]] = {}
+        
+        for pilot in pilots:
+            self.by_status.setdefault(pilot.status, []).append(pilot)
+            self.by_location.setdefault(pilot.location.lower(), []).append(pilot)
+            for skill in {s.lower() for s in pilot.skills}:
+                self.by_skill.setdefault(skill, []).append(pilot)
+            for cert in {c.lower() for c in pilot.certifications}:
+                self.by_cert.setdefault(cert, []).append(pilot)
+
+# Worksheet backing each cached data set
+WORKSHEETS = {
+    "pilots": "pilot_roster",
+    "drones": "drone_fleet",
+    "missions": "missions"
+}
+
 class SheetsService:
     """Service for Google Sheets integration"""
     
@@ -22,16 +99,34 @@ class SheetsService:
         ]
         self.credentials = None
         self.client = None
+        self._auth_attempted = False
         self.sheets = {}
+        self._worksheets = {}
+        
+        # Shared pool for concurrent per-sheet reads
+        self._fetch_pool = ThreadPoolExecutor(max_workers=len(WORKSHEETS))
         
         # Local cache
         self._pilots_cache = None
         self._drones_cache = None
         self._missions_cache = None
+        self._cache_times: Dict[str, datetime] = {}
+        self._pilot_index: Optional[PilotIndex] = None
+        self._serialized: Dict[str, Tuple[list, List[Dict[str, Any]]]] = {}
+        self._drone_search_rows: Optional[Tuple[list, list]] = None
+        self._drone_maintenance: Optional[Tuple[list, list, np.ndarray]] = None
+        self._deployment_view: Optional[Tuple[list, list, List[Dict[str, Any]]]] = None
+        self._pilot_rows: Dict[str, int] = {}
+        self._drone_rows: Dict[str, int] = {}
+        self._dict_groups: Dict[Tuple[str, str], Tuple[list, Dict[Any, List[Dict[str, Any]]]]] = {}
+        
+        # Bumped on every invalidation and on refetches that change data so derived caches (and response ETags) can tell when sheet data changed
+        self.data_version = 0
         self._last_sync = None
         
     def authenticate(self):
         """Authenticate with Google Sheets API"""
+        self._auth_attempted = True
         try:
             # Try to get credentials from environment variable
             creds_json = os.getenv('GOOGLE_CREDENTIALS_JSON')
@@ -56,138 +151,344 @@ class SheetsService:
             # Fallback to local data if available
             logger.info("Falling back to local data")
     
-    def _get_sheet(self, sheet_name: str, worksheet_name: str = None):
-        """Get a specific sheet"""
+    def _get_spreadsheet(self, sheet_name: str):
+        """Get (and remember) a spreadsheet by name"""
         try:
             if sheet_name not in self.sheets:
+                # Authenticate lazily if startup never tried; after one failed attempt, go straight to local data
+                if self.client is None and not self._auth_attempted:
+                    self.authenticate()
+                if self.client is None:
+                    return None
                 self.sheets[sheet_name] = self.client.open(sheet_name)
-            
-            sheet = self.sheets[sheet_name]
-            if worksheet_name:
-                return sheet.worksheet(worksheet_name)
-            return sheet.sheet1
+            return self.sheets[sheet_name]
             
         except Exception as e:
             logger.error(f"Error accessing sheet {sheet_name}: {e}")
             return None
     
-    def get_pilots(self) -> List[Pilot]:
-        """Get all pilots from Google Sheets"""
+    def _get_sheet(self, sheet_name: str, worksheet_name: str = None):
+        """Get a specific sheet"""
         try:
-            if self._pilots_cache and self._last_sync:
-                # Return cache if recent (less than 5 minutes old)
-                if (datetime.now() - self._last_sync).seconds < 300:
-                    return self._pilots_cache
+            sheet = self._get_spreadsheet(sheet_name)
+            if not sheet:
+                return None
             
-            # Try to get from Google Sheets
-            worksheet = self._get_sheet("Drone Operations", "pilot_roster")
-            if worksheet:
-                records = worksheet.get_all_records()
-                pilots = []
-                
-                for record in records:
-                    # Parse skills and certifications from strings to lists
-                    skills = [s.strip() for s in record.get('skills', '').split(',')]
-                    certs = [c.strip() for c in record.get('certifications', '').split(',')]
-                    
-                    pilot = Pilot(
-                        pilot_id=record.get('pilot_id', ''),
-                        name=record.get('name', ''),
-                        skills=skills,
-                        certifications=certs,
-                        location=record.get('location', ''),
-                        status=record.get('status', 'Available'),
-                        current_assignment=record.get('current_assignment', None),
-                        available_from=self._parse_date(record.get('available_from', ''))
-                    )
-                    pilots.append(pilot)
-                
-                self._pilots_cache = pilots
-                self._last_sync = datetime.now()
-                return pilots
-            
-            # Fallback to local data
-            return self._load_local_pilots()
+            # Worksheet handles are reused so writes skip a metadata lookup each time
+            key = (sheet_name, worksheet_name)
+            if key not in self._worksheets:
+                self._worksheets[key] = sheet.worksheet(worksheet_name) if worksheet_name else sheet.sheet1
+            return self._worksheets[key]
             
         except Exception as e:
-            logger.error(f"Error getting pilots: {e}")
-            return self._load_local_pilots()
+            logger.error(f"Error accessing sheet {sheet_name}: {e}")
+            return None
+    
+    def get_pilots(self) -> List[Pilot]:
+        """Get all pilots from Google Sheets"""
+        # Return cache if recent (less than 5 minutes old)
+        if self._pilots_cache is not None and self._is_cache_fresh("pilots"):
+            return self._pilots_cache
+        
+        return self._store_cache("pilots", self._fetch_sheet("pilots"))
+    
+    def get_pilot_index(self, pilots: Optional[List[Pilot]] = None) -> PilotIndex:
+        """Get lookup tables for the given (or cached) pilot list, rebuilding only when the list changes"""
+        if pilots is None:
+            pilots = self.get_pilots()
+        
+        if self._pilot_index is None or self._pilot_index.pilots is not pilots:
+            self._pilot_index = PilotIndex(pilots)
+        return self._pilot_index
+    
+    def get_pilot_dicts(self) -> List[Dict[str, Any]]:
+        """Get all pilots as plain dicts, serialized once per fetch"""
+        return self._serialize("pilots", self.get_pilots())
+    
+    def get_drone_dicts(self) -> List[Dict[str, Any]]:
+        """Get all drones as plain dicts, serialized once per fetch"""
+        return self._serialize("drones", self.get_drones())
+    
+    def get_drone_search_rows(self) -> List[Tuple[Dict[str, Any], frozenset, str, str]]:
+        """Get drone dicts with their lowercased capabilities, location and status, computed once per fetch
+        and ordered by maintenance due date"""
+        drones = self.get_drone_dicts()
+        cached = self._drone_search_rows
+        if cached is None or cached[0] is not drones:
+            rows = [
+                (d, frozenset(c.lower() for c in d["capabilities"]), d["location"].lower(), d["status"].lower())
+                for d in sorted(drones, key=lambda d: d["maintenance_due"] or _FAR_FUTURE)
+            ]
+            cached = self._drone_search_rows = (drones, rows)
+        return cached[1]
+    
+    def get_drone_maintenance_schedule(self) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """Get dicts for drones with a maintenance date plus those dates as a datetime64 array, built once per fetch"""
+        drones = self.get_drone_dicts()
+        cached = self._drone_maintenance
+        if cached is None or cached[0] is not drones:
+            scheduled = [d for d in drones if d["maintenance_due"]]
+            due_dates = np.array([d["maintenance_due"] for d in scheduled], dtype='datetime64[D]')
+            cached = self._drone_maintenance = (drones, scheduled, due_dates)
+        return cached[1], cached[2]
+    
+    def get_deployment_view(self) -> List[Dict[str, Any]]:
+        """Get each drone joined with its first assigned mission, rebuilt only when drones or missions are refetched"""
+        missions, _, drones = self.get_all_data()
+        cached = self._deployment_view
+        if cached is None or cached[0] is not drones or cached[1] is not missions:
+            mission_by_drone = {m.assigned_drone: m for m in reversed(missions) if m.assigned_drone}
+            view = []
+            for drone in drones:
+                mission = mission_by_drone.get(drone.drone_id)
+                view.append({
+                    "drone_id": drone.drone_id,
+                    "model": drone.model,
+                    "status": drone.status,
+                    "location": drone.location,
+                    "assigned_to": mission.project_id if mission else None,
+                    "client": mission.client if mission else None,
+                    "mission_dates": f"{mission.start_date} to {mission.end_date}" if mission else None,
+                    "maintenance_due": drone.maintenance_due,
+                    "capabilities": drone.capabilities
+                })
+            cached = self._deployment_view = (drones, missions, view)
+        return cached[2]
+    
+    def get_mission_dicts(self) -> List[Dict[str, Any]]:
+        """Get all missions as plain dicts, serialized once per fetch"""
+        return self._serialize("missions", self.get_missions())
+    
+    def get_records_with_dicts(self, name: str) -> Tuple[list, List[Dict[str, Any]]]:
+        """Get a data set's models together with their pre-serialized dicts, aligned by position"""
+        records = {"pilots": self.get_pilots, "drones": self.get_drones, "missions": self.get_missions}[name]()
+        return records, self._serialize(name, records)
+    
+    def filter_dicts(self, name: str, **filters) -> List[Dict[str, Any]]:
+        """Get a data set's dicts matching every non-empty field filter, scanning only the smallest matching group"""
+        dicts = {
+            "pilots": self.get_pilot_dicts,
+            "drones": self.get_drone_dicts,
+            "missions": self.get_mission_dicts
+        }[name]()
+        active = {field: value for field, value in filters.items() if value}
+        if not active:
+            return dicts
+        
+        groups = [self._group_dicts(name, dicts, field).get(value, []) for field, value in active.items()]
+        smallest = min(groups, key=len)
+        if len(active) == 1:
+            return smallest
+        return [d for d in smallest if all(d[field] == value for field, value in active.items())]
+    
+    def _group_dicts(self, name: str, dicts: List[Dict[str, Any]], field: str) -> Dict[Any, List[Dict[str, Any]]]:
+        """Group a data set's dicts by one field, reusing the groups until the data set is refetched"""
+        cached = self._dict_groups.get((name, field))
+        if cached is None or cached[0] is not dicts:
+            groups: Dict[Any, List[Dict[str, Any]]] = {}
+            for d in dicts:
+                groups.setdefault(d[field], []).append(d)
+            cached = self._dict_groups[(name, field)] = (dicts, groups)
+        return cached[1]
+    
+    def _serialize(self, name: str, records: list) -> List[Dict[str, Any]]:
+        """Return dicts for a record list, reusing them until the list is refetched"""
+        cached = self._serialized.get(name)
+        if cached is None or cached[0] is not records:
+            cached = (records, [r.dict() for r in records])
+            self._serialized[name] = cached
+        return cached[1]
     
     def get_drones(self) -> List[Drone]:
         """Get all drones from Google Sheets"""
+        if self._drones_cache is not None and self._is_cache_fresh("drones"):
+            return self._drones_cache
+        
+        return self._store_cache("drones", self._fetch_sheet("drones"))
+    
+    def get_missions(self) -> List[Mission]:
+        """Get all missions from Google Sheets"""
+        if self._missions_cache is not None and self._is_cache_fresh("missions"):
+            return self._missions_cache
+        
+        return self._store_cache("missions", self._fetch_sheet("missions"))
+    
+    def get_all_data(self) -> Tuple[List[Mission], List[Pilot], List[Drone]]:
+        """Get missions, pilots and drones, refreshing stale sheets in one batch request"""
+        stale = [name for name in ("missions", "pilots", "drones") if not self._is_cache_fresh(name)]
+        if stale:
+            self._store_caches(self._fetch_all(stale))
+        return self._missions_cache, self._pilots_cache, self._drones_cache
+    
+    def _fetch_sheet(self, name: str) -> list:
+        """Read and parse one data set from its worksheet, falling back to the local CSV"""
+        parse, load_local = {
+            "pilots": (self._parse_pilot_records, self._load_local_pilots),
+            "drones": (self._parse_drone_records, self._load_local_drones),
+            "missions": (self._parse_mission_records, self._load_local_missions)
+        }[name]
         try:
-            if self._drones_cache and self._last_sync:
-                if (datetime.now() - self._last_sync).seconds < 300:
-                    return self._drones_cache
-            
-            worksheet = self._get_sheet("Drone Operations", "drone_fleet")
+            worksheet = self._get_sheet("Drone Operations", WORKSHEETS[name])
             if worksheet:
-                records = worksheet.get_all_records()
-                drones = []
-                
-                for record in records:
-                    capabilities = [c.strip() for c in record.get('capabilities', '').split(',')]
-                    
-                    drone = Drone(
-                        drone_id=record.get('drone_id', ''),
-                        model=record.get('model', ''),
-                        capabilities=capabilities,
-                        status=record.get('status', 'Available'),
-                        location=record.get('location', ''),
-                        current_assignment=record.get('current_assignment', None),
-                        maintenance_due=self._parse_date(record.get('maintenance_due', ''))
-                    )
-                    drones.append(drone)
-                
-                self._drones_cache = drones
-                self._last_sync = datetime.now()
-                return drones
-            
-            return self._load_local_drones()
-            
+                return parse(worksheet.get_all_records())
         except Exception as e:
-            logger.error(f"Error getting drones: {e}")
-            return self._load_local_drones()
+            logger.error(f"Error getting {name}: {e}")
+        
+        return load_local()
     
-    def get_missions(self) -> List[Mission]:
-        """Get all missions from Google Sheets"""
+    def _fetch_all(self, names: List[str]) -> Dict[str, list]:
+        """Read and parse several data sets without touching the cache, in one batch request where possible"""
+        if self.client and len(names) > 1:
+            records = self.batch_get_records([WORKSHEETS[name] for name in names])
+            if records and all(WORKSHEETS[name] in records for name in names):
+                parsers = {
+                    "pilots": self._parse_pilot_records,
+                    "drones": self._parse_drone_records,
+                    "missions": self._parse_mission_records
+                }
+                return {name: parsers[name](records[WORKSHEETS[name]]) for name in names}
+        
+        # Single sheet or failed batch: the per-sheet reads are independent I/O, so run them concurrently
+        return dict(zip(names, self._fetch_pool.map(self._fetch_sheet, names)))
+    
+    def batch_get_records(self, worksheet_names: List[str]) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """Fetch several worksheets with a single values.batchGet round trip"""
         try:
-            if self._missions_cache and self._last_sync:
-                if (datetime.now() - self._last_sync).seconds < 300:
-                    return self._missions_cache
+            spreadsheet = self._get_spreadsheet("Drone Operations")
+            if not spreadsheet:
+                return None
             
-            worksheet = self._get_sheet("Drone Operations", "missions")
-            if worksheet:
-                records = worksheet.get_all_records()
-                missions = []
-                
-                for record in records:
-                    skills = [s.strip() for s in record.get('required_skills', '').split(',')]
-                    certs = [c.strip() for c in record.get('required_certs', '').split(',')]
-                    
-                    mission = Mission(
-                        project_id=record.get('project_id', ''),
-                        client=record.get('client', ''),
-                        location=record.get('location', ''),
-                        required_skills=skills,
-                        required_certs=certs,
-                        start_date=self._parse_date(record.get('start_date', '')),
-                        end_date=self._parse_date(record.get('end_date', '')),
-                        priority=record.get('priority', 'Standard'),
-                        assigned_pilot=record.get('assigned_pilot', None),
-                        assigned_drone=record.get('assigned_drone', None)
-                    )
-                    missions.append(mission)
-                
-                self._missions_cache = missions
-                self._last_sync = datetime.now()
-                return missions
+            response = spreadsheet.values_batch_get([f"'{name}'" for name in worksheet_names])
+            value_ranges = response.get('valueRanges', [])
             
-            return self._load_local_missions()
+            return {
+                name: self._rows_to_records(value_range.get('values', []))
+                for name, value_range in zip(worksheet_names, value_ranges)
+            }
             
         except Exception as e:
-            logger.error(f"Error getting missions: {e}")
-            return self._load_local_missions()
+            logger.error(f"Error batch fetching {worksheet_names}: {e}")
+            return None
+    
+    def _rows_to_records(self, rows: List[List[Any]]) -> List[Dict[str, Any]]:
+        """Convert a header row plus value rows into records, like worksheet.get_all_records()"""
+        if not rows:
+            return []
+        
+        header = rows[0]
+        return [
+            dict(zip(header, row + [''] * (len(header) - len(row))))
+            for row in rows[1:]
+        ]
+    
+    def _record_rows(self, records: List[Dict[str, Any]], id_field: str) -> Dict[str, int]:
+        """Map each record id to its sheet row (records start below the header row) so writes skip a sheet search"""
+        rows = {}
+        for i, record in enumerate(records):
+            rows.setdefault(str(record.get(id_field, '')), i + 2)
+        return rows
+    
+    def _parse_pilot_records(self, records: List[Dict[str, Any]]) -> List[Pilot]:
+        """Build Pilot models from sheet records"""
+        pilots = []
+        self._pilot_rows = self._record_rows(records, 'pilot_id')
+        
+        for record in records:
+            # Parse skills and certifications from strings to lists
+            skills = [sys.intern(s.strip()) for s in record.get('skills', '').split(',')]
+            certs = [sys.intern(c.strip()) for c in record.get('certifications', '').split(',')]
+            
+            pilot = Pilot(
+                pilot_id=record.get('pilot_id', ''),
+                name=record.get('name', ''),
+                skills=skills,
+                certifications=certs,
+                location=_intern(record.get('location', '')),
+                status=_normalize_status(record.get('status', 'Available')),
+                current_assignment=record.get('current_assignment', None),
+                available_from=self._parse_date(record.get('available_from', ''))
+            )
+            pilots.append(pilot)
+        
+        return pilots
+    
+    def _parse_drone_records(self, records: List[Dict[str, Any]]) -> List[Drone]:
+        """Build Drone models from sheet records"""
+        drones = []
+        
+        self._drone_rows = self._record_rows(records, 'drone_id')
+        
+        for record in records:
+            capabilities = [sys.intern(c.strip()) for c in record.get('capabilities', '').split(',')]
+            
+            drone = Drone(
+                drone_id=record.get('drone_id', ''),
+                model=record.get('model', ''),
+                capabilities=capabilities,
+                status=_normalize_status(record.get('status', 'Available')),
+                location=_intern(record.get('location', '')),
+                current_assignment=record.get('current_assignment', None),
+                maintenance_due=self._parse_date(record.get('maintenance_due', ''))
+            )
+            drones.append(drone)
+        
+        return drones
+    
+    def _parse_mission_records(self, records: List[Dict[str, Any]]) -> List[Mission]:
+        """Build Mission models from sheet records"""
+        missions = []
+        
+        for record in records:
+            skills = [sys.intern(s.strip()) for s in record.get('required_skills', '').split(',')]
+            certs = [sys.intern(c.strip()) for c in record.get('required_certs', '').split(',')]
+            
+            mission = Mission(
+                project_id=record.get('project_id', ''),
+                client=record.get('client', ''),
+                location=_intern(record.get('location', '')),
+                required_skills=skills,
+                required_certs=certs,
+                start_date=self._parse_date(record.get('start_date', '')),
+                end_date=self._parse_date(record.get('end_date', '')),
+                priority=record.get('priority', 'Standard'),
+                assigned_pilot=record.get('assigned_pilot', None),
+                assigned_drone=record.get('assigned_drone', None)
+            )
+            missions.append(mission)
+        
+        return missions
+    
+    def _is_cache_fresh(self, name: str) -> bool:
+        """Check whether a cached sheet is younger than the cache TTL"""
+        cached_at = self._cache_times.get(name)
+        return cached_at is not None and (datetime.now() - cached_at).total_seconds() < CACHE_TTL_SECONDS
+    
+    def invalidate_cache(self, *names: str):
+        """Drop cached sheet data (all sheets when no names are given) so the next read refetches"""
+        for name in names or WORKSHEETS:
+            setattr(self, f"_{name}_cache", None)
+            self._cache_times.pop(name, None)
+        self.data_version += 1
+    
+    def _store_cache(self, name: str, records: list) -> list:
+        """Cache one freshly fetched data set and return the cached list"""
+        self._store_caches({name: records})
+        return getattr(self, f"_{name}_cache")
+    
+    def _store_caches(self, fetched: Dict[str, list]):
+        """Swap freshly fetched data sets into the cache, keeping the old lists (and everything derived
+        from them) when the sheet content is unchanged; the data version moves only on a real change"""
+        now = datetime.now()
+        changed = False
+        for name, records in fetched.items():
+            if getattr(self, f"_{name}_cache") != records:
+                setattr(self, f"_{name}_cache", records)
+                changed = True
+            self._cache_times[name] = now
+        
+        self._last_sync = now
+        if changed:
+            self.data_version += 1
     
     def get_pilot(self, pilot_id: str) -> Optional[Pilot]:
         """Get a specific pilot"""
@@ -221,15 +522,15 @@ class SheetsService:
                 return False
             
             # Find the row with the pilot_id
-            cell = worksheet.find(pilot_id)
-            if not cell:
+            row = self._find_row(worksheet, self._pilot_rows, pilot_id)
+            if not row:
                 return False
             
-            # Update status in column G (status column)
-            worksheet.update_cell(cell.row, 6, status)
+            # Update status in column F (status column)
+            worksheet.update_cell(row, 6, status)
             
             # Clear cache to force refresh
-            self._pilots_cache = None
+            self.invalidate_cache("pilots")
             
             # Also update local CSV
             self._update_local_pilot_status(pilot_id, status)
@@ -248,14 +549,14 @@ class SheetsService:
             if not worksheet:
                 return False
             
-            cell = worksheet.find(drone_id)
-            if not cell:
+            row = self._find_row(worksheet, self._drone_rows, drone_id)
+            if not row:
                 return False
             
             # Update status in column D (status column)
-            worksheet.update_cell(cell.row, 4, status)
+            worksheet.update_cell(row, 4, status)
             
-            self._drones_cache = None
+            self.invalidate_cache("drones")
             self._update_local_drone_status(drone_id, status)
             
             logger.info(f"Updated drone {drone_id} status to {status}")
@@ -265,6 +566,108 @@ class SheetsService:
             logger.error(f"Error updating drone status: {e}")
             return False
     
+    def update_drone_maintenance(self, drone_id: str, maintenance_due: str) -> bool:
+        """Update drone maintenance due date in Google Sheets"""
+        try:
+            worksheet = self._get_sheet("Drone Operations", "drone_fleet")
+            if not worksheet:
+                return False
+            
+            row = self._find_row(worksheet, self._drone_rows, drone_id)
+            if not row:
+                return False
+            
+            # Update maintenance due date in column G
+            worksheet.update_cell(row, 7, maintenance_due)
+            
+            self.invalidate_cache("drones")
+            
+            logger.info(f"Updated drone {drone_id} maintenance due date to {maintenance_due}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error updating drone maintenance: {e}")
+            return False
+    
+    def free_resources(self, pilot_id: Optional[str], drone_id: Optional[str]) -> List[str]:
+        """Mark a pilot and a drone Available with a single batched sheet write, returning the IDs left unfreed"""
+        # Status lives in column F of the roster and column D of the fleet
+        requested = [(pilot_id, "pilots", self._pilot_rows, "F"), (drone_id, "drones", self._drone_rows, "D")]
+        requested = [request for request in requested if request[0]]
+        freed = []
+        
+        try:
+            spreadsheet = self._get_spreadsheet("Drone Operations")
+            targets = []
+            if spreadsheet:
+                for record_id, name, rows, column in requested:
+                    worksheet = self._get_sheet("Drone Operations", WORKSHEETS[name])
+                    if worksheet:
+                        targets.append((worksheet, rows, record_id, name, column))
+            
+            found = [
+                (target, row)
+                for target, row in zip(targets, self._find_rows([target[:3] for target in targets]))
+                if row
+            ]
+            if found:
+                spreadsheet.values_batch_update({
+                    'valueInputOption': 'USER_ENTERED',
+                    'data': [
+                        {'range': f"'{worksheet.title}'!{column}{row}", 'values': [["Available"]]}
+                        for (worksheet, _, _, _, column), row in found
+                    ]
+                })
+                freed = [(record_id, name) for (_, _, record_id, name, _), _ in found]
+            
+        except Exception as e:
+            logger.error(f"Error freeing resources: {e}")
+        
+        # Mirror only what was actually written to the sheet
+        if freed:
+            self.invalidate_cache(*{name for _, name in freed})
+        for record_id, name in freed:
+            if name == "pilots":
+                self._update_local_pilot_status(record_id, "Available")
+            else:
+                self._update_local_drone_status(record_id, "Available")
+        
+        unfreed = [record_id for record_id, name, _, _ in requested if (record_id, name) not in freed]
+        if unfreed:
+            logger.error(f"Could not mark {', '.join(unfreed)} Available")
+        else:
+            logger.info(f"Freed pilot {pilot_id} and drone {drone_id}")
+        return unfreed
+    
+    def _find_row(self, worksheet, rows: Dict[str, int], record_id: str) -> Optional[int]:
+        """Get a record's sheet row from a row map built at load, confirming the id cell before trusting it"""
+        return self._find_rows([(worksheet, rows, record_id)])[0]
+    
+    def _find_rows(self, lookups: List[Tuple[Any, Dict[str, int], str]]) -> List[Optional[int]]:
+        """Get several records' sheet rows from the row maps built at load, confirming every id cell
+        with a single batched read"""
+        rows = [row_map.get(record_id) for _, row_map, record_id in lookups]
+        
+        mapped = [i for i, row in enumerate(rows) if row]
+        if mapped:
+            ranges = [f"'{lookups[i][0].title}'!A{rows[i]}" for i in mapped]
+            value_ranges = lookups[0][0].spreadsheet.values_batch_get(ranges).get('valueRanges', [])
+            for i, value_range in zip(mapped, value_ranges):
+                values = value_range.get('values') or [['']]
+                if str(values[0][0]) != lookups[i][2]:
+                    rows[i] = None
+            for i in mapped[len(value_ranges):]:
+                rows[i] = None
+        
+        # Map missing or stale (rows moved since the last fetch); search the sheet
+        for i, row in enumerate(rows):
+            if not row:
+                worksheet, _, record_id = lookups[i]
+                cell = worksheet.find(record_id)
+                rows[i] = cell.row if cell else None
+        
+        return rows
+    
     def assign_to_mission(self, project_id: str, pilot_id: str, drone_id: str) -> bool:
         """Assign pilot and drone to mission"""
         try:
@@ -294,9 +697,7 @@ class SheetsService:
                     drone_worksheet.update_cell(cell.row, 4, "In Use")  # status
             
             # Clear all caches
-            self._pilots_cache = None
-            self._drones_cache = None
-            self._missions_cache = None
+            self.invalidate_cache()
             
             logger.info(f"Assigned {pilot_id} and {drone_id} to {project_id}")
             return True
@@ -308,17 +709,9 @@ class SheetsService:
     def sync_all_data(self):
         """Sync all data between local cache and Google Sheets"""
         try:
-            # Force refresh all caches
-            self._pilots_cache = None
-            self._drones_cache = None
-            self._missions_cache = None
-            
-            # Get fresh data
-            self.get_pilots()
-            self.get_drones()
-            self.get_missions()
-            
-            self._last_sync = datetime.now()
+            # Fetch everything before touching the cache so readers keep the current data meanwhile
+            fetched = self._fetch_all(list(WORKSHEETS))
+            self._store_caches(fetched)
             logger.info("Data sync completed")
             
         except Exception as e:
@@ -330,13 +723,7 @@ class SheetsService:
             return None
         
         try:
-            # Try different date formats
-            for fmt in ('%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y'):
-                try:
-                    return datetime.strptime(date_str.strip(), fmt).date()
-                except ValueError:
-                    continue
-            return None
+            return _parse_date_string(date_str.strip())
         except Exception:
             return None
     
@@ -347,16 +734,16 @@ class SheetsService:
             pilots = []
             
             for _, row in df.iterrows():
-                skills = [s.strip() for s in str(row.get('skills', '')).split(',')]
-                certs = [c.strip() for c in str(row.get('certifications', '')).split(',')]
+                skills = [sys.intern(s.strip()) for s in str(row.get('skills', '')).split(',')]
+                certs = [sys.intern(c.strip()) for c in str(row.get('certifications', '')).split(',')]
                 
                 pilot = Pilot(
                     pilot_id=row.get('pilot_id', ''),
                     name=row.get('name', ''),
                     skills=skills,
                     certifications=certs,
-                    location=row.get('location', ''),
-                    status=row.get('status', 'Available'),
+                    location=_intern(row.get('location', '')),
+                    status=_normalize_status(row.get('status', 'Available')),
                     current_assignment=row.get('current_assignment', None),
                     available_from=self._parse_date(row.get('available_from', ''))
                 )
@@ -375,14 +762,14 @@ class SheetsService:
             drones = []
             
             for _, row in df.iterrows():
-                capabilities = [c.strip() for c in str(row.get('capabilities', '')).split(',')]
+                capabilities = [sys.intern(c.strip()) for c in str(row.get('capabilities', '')).split(',')]
                 
                 drone = Drone(
                     drone_id=row.get('drone_id', ''),
                     model=row.get('model', ''),
                     capabilities=capabilities,
-                    status=row.get('status', 'Available'),
-                    location=row.get('location', ''),
+                    status=_normalize_status(row.get('status', 'Available')),
+                    location=_intern(row.get('location', '')),
                     current_assignment=row.get('current_assignment', None),
                     maintenance_due=self._parse_date(row.get('maintenance_due', ''))
                 )
@@ -401,13 +788,13 @@ class SheetsService:
             missions = []
             
             for _, row in df.iterrows():
-                skills = [s.strip() for s in str(row.get('required_skills', '')).split(',')]
-                certs = [c.strip() for c in str(row.get('required_certs', '')).split(',')]
+                skills = [sys.intern(s.strip()) for s in str(row.get('required_skills', '')).split(',')]
+                certs = [sys.intern(c.strip()) for c in str(row.get('required_certs', '')).split(',')]
                 
                 mission = Mission(
                     project_id=row.get('project_id', ''),
                     client=row.get('client', ''),
-                    location=row.get('location', ''),
+                    location=_intern(row.get('location', '')),
                     required_skills=skills,
                     required_certs=certs,
                     start_date=self._parse_date(row.get('start_date', '')),